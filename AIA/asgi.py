@@ -3,5 +3,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "AIA.settings")
+# Serve the read endpoints with their async views (see core.async_views).
+os.environ.setdefault("ASYNC_READ_VIEWS", "True")
 
 application = get_asgi_application()
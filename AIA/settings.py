@@ -154,7 +154,7 @@ if USE_S3:
     AWS_S3_CUSTOM_DOMAIN = env("AWS_S3_CUSTOM_DOMAIN", default=None)
 
     STORAGES["default"] = {
-        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        "BACKEND": "core.storage.CachedURLS3Storage",
         "OPTIONS": {
             "access_key": AWS_ACCESS_KEY_ID,
             "secret_key": AWS_SECRET_ACCESS_KEY,
@@ -168,6 +168,15 @@ if USE_S3:
     else:
         MEDIA_URL = f'{AWS_S3_ENDPOINT_URL.rstrip("/")}/{AWS_STORAGE_BUCKET_NAME}/'
 
+# Seconds a generated (signed) media URL is reused (see core.storage); must stay
+# below AWS_QUERYSTRING_EXPIRE, the signature lifetime.
+MEDIA_URL_CACHE_TIMEOUT = env.int("MEDIA_URL_CACHE_TIMEOUT", default=1800)
+
+# Password hashing worker pool (see core.hashing); 0 workers hashes inline.
+PASSWORD_HASHING_WORKERS = env.int("PASSWORD_HASHING_WORKERS", default=2)
+PASSWORD_HASHING_MAX_PENDING = env.int("PASSWORD_HASHING_MAX_PENDING", default=64)
+PASSWORD_HASHING_TIMEOUT = env.float("PASSWORD_HASHING_TIMEOUT", default=10.0)
+
 AUTHENTICATION_BACKENDS = [
     "core.models.EmailModelBackend",
     "django.contrib.auth.backends.ModelBackend",
@@ -177,7 +186,7 @@ AUTHENTICATION_BACKENDS = [
 # REST framework configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "participant.authentication.ParticipantJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -187,6 +196,9 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.JSONRenderer",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Reverse proxies in front of the app; the client IP used by throttles is
+    # taken that many hops from the end of X-Forwarded-For, or REMOTE_ADDR at 0.
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=0),
 }
 
 if DEBUG:
@@ -195,12 +207,79 @@ if DEBUG:
     )
 
 
+# Sliding-window limits for the unauthenticated endpoints (see core.throttling).
+AUTH_THROTTLE_STORE = env(
+    "AUTH_THROTTLE_STORE", default="core.throttling.LocalThrottleStore"
+)
+AUTH_THROTTLE_RATES = {
+    "sign-in": {"ip": "30/min", "email": "10/min"},
+    "sign-up": {"ip": "10/min", "email": "3/min"},
+    "password-reset": {"ip": "10/min", "email": "3/hour"},
+    # The email limit bounds guesses at one account's code across many IPs.
+    "password-reset-confirm": {"ip": "10/min", "email": "10/hour"},
+}
+
+
 # Simple JWT settings (tweak as needed)
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# Shared cache from CACHE_URL: locmemcache:// (the default) keeps it in each
+# process, filecache:///var/tmp/aia-cache shares it between the processes of one
+# host and redis://host:6379/0 between every node.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# In-process LRU in front of the shared cache (see core.cache): entries kept,
+# and seconds a local copy is trusted, which bounds cross-node staleness.
+LOCAL_CACHE_MAX_ENTRIES = env.int("LOCAL_CACHE_MAX_ENTRIES", default=1000)
+LOCAL_CACHE_TIMEOUT = env.int("LOCAL_CACHE_TIMEOUT", default=5)
+
+# Seconds a cache recomputation lock is held before waiting callers compute
+# the value themselves.
+CACHE_LOCK_TIMEOUT = env.int("CACHE_LOCK_TIMEOUT", default=10)
+
+# Answer the read endpoints with their async views (see core.async_views). Only
+# worth it under ASGI, so AIA/asgi.py turns it on; WSGI keeps the DRF views.
+ASYNC_READ_VIEWS = env.bool("ASYNC_READ_VIEWS", default=False)
+
+# Cache-Control max-age, in seconds, for public read endpoints (see core.http).
+PUBLIC_CACHE_MAX_AGE = env.int("PUBLIC_CACHE_MAX_AGE", default=60)
+
+# Upper bound, in seconds, on how long the next-event response is cached.
+NEXT_EVENT_CACHE_TIMEOUT = env.int("NEXT_EVENT_CACHE_TIMEOUT", default=300)
+
+# Seconds a pre-rendered per-event plan catalog stays cached.
+PLAN_CATALOG_CACHE_TIMEOUT = env.int("PLAN_CATALOG_CACHE_TIMEOUT", default=3600)
+
+# Seconds the pre-rendered staff teams of an event stay cached; like the profile
+# cache, keep it below the remaining lifetime of cached signed media URLs.
+STAFF_TEAMS_CACHE_TIMEOUT = env.int("STAFF_TEAMS_CACHE_TIMEOUT", default=300)
+
+# Seconds a waiting-room ticket stays valid after it is issued. The admission
+# slots are counted in CACHE_URL; with locmemcache:// every process keeps its own
+# counters, so an event admits admission_rate users per second per process.
+WAITING_ROOM_TICKET_MAX_AGE = env.int("WAITING_ROOM_TICKET_MAX_AGE", default=1800)
+
+# Seconds an authenticated user's identity and flags stay cached; only used with a
+# shared CACHE_URL, since a per-process cache would miss invalidations.
+JWT_USER_CACHE_TIMEOUT = env.int("JWT_USER_CACHE_TIMEOUT", default=60)
+
+# Seconds a serialized participant profile stays cached; keep it below the
+# remaining lifetime of cached signed media URLs (AWS_QUERYSTRING_EXPIRE minus
+# MEDIA_URL_CACHE_TIMEOUT). Only used with a shared CACHE_URL.
+PROFILE_CACHE_TIMEOUT = env.int("PROFILE_CACHE_TIMEOUT", default=300)
+
+
+# Direct-to-storage uploads (see participant.uploads): presigned URL lifetime in
+# seconds and maximum size in bytes per ParticipantInfo file field.
+UPLOAD_URL_EXPIRY = env.int("UPLOAD_URL_EXPIRY", default=600)
+UPLOAD_MAX_SIZES = {
+    "resume": env.int("RESUME_MAX_UPLOAD_SIZE", default=5 * 1024 * 1024),
+    "image": env.int("IMAGE_MAX_UPLOAD_SIZE", default=5 * 1024 * 1024),
+}
+
 
 # drf-spectacular / OpenAPI
 SPECTACULAR_SETTINGS = {
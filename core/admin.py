@@ -1,9 +1,29 @@
-from core.models import Event
+from core.models import Event, OutgoingEmail
+from core.pagination import EstimatedCountPaginator
 from django.contrib import admin
+from django.utils import timezone
 
 
 class EventAdmin(admin.ModelAdmin):
-    list_display = ("name", "starting_date")
+    list_display = ("name", "starting_date", "waiting_room_enabled", "admission_rate")
+    list_editable = ("waiting_room_enabled", "admission_rate")
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to", "status", "attempts", "next_attempt_time")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = ("created_time", "sent_time", "last_error")
+    actions = ("retry",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.action(description="Retry selected emails")
+    def retry(self, request, queryset):
+        queryset.exclude(status="S").update(
+            status="P", attempts=0, next_attempt_time=timezone.now()
+        )
 
 
 admin.site.register(Event, EventAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
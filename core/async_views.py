@@ -0,0 +1,74 @@
+"""ASGI-native read paths for DRF endpoints.
+
+DRF views are synchronous, so under ASGI Django hands every request to them
+to a worker thread with ``sync_to_async``. ``async_reads`` keeps the DRF view
+for writes, OPTIONS and the OpenAPI schema, but answers GET and HEAD with a
+coroutine that reads through the cache's and the ORM's async APIs and renders
+the same JSON the DRF view would.
+
+Under WSGI Django would have to run each coroutine through ``async_to_sync``,
+which is several times slower than the DRF view, so ``async_reads`` only
+routes to the coroutine when ``ASYNC_READ_VIEWS`` is on; ``AIA/asgi.py``
+turns it on.
+
+Read coroutines return ``HttpResponse`` objects (see ``json_response``);
+``handle_api_errors`` turns DRF exceptions and ``Http404`` into the error
+bodies DRF's exception handler produces.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+
+READ_METHODS = ("GET", "HEAD")
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        JSONRenderer().render(data), content_type="application/json", status=status
+    )
+
+
+def error_response(exc):
+    data = (
+        exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+    )
+    return json_response(data, status=exc.status_code)
+
+
+def handle_api_errors(read):
+    @wraps(read)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await read(request, *args, **kwargs)
+        except Http404 as exc:
+            return error_response(exceptions.NotFound(*exc.args))
+        except exceptions.APIException as exc:
+            return error_response(exc)
+
+    return wrapper
+
+
+def async_reads(view_class, read, **initkwargs):
+    """Return a URL view answering GET and HEAD with the coroutine
+    ``read(request, *args, **kwargs)`` and every other method with
+    ``view_class.as_view(**initkwargs)``; just the latter unless
+    ``ASYNC_READ_VIEWS`` is on."""
+    view = view_class.as_view(**initkwargs)
+    if not settings.ASYNC_READ_VIEWS:
+        return view
+    sync_view = sync_to_async(view)
+
+    async def dispatch(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await read(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    # csrf_exempt, cls and initkwargs: CsrfViewMiddleware leaves the CSRF
+    # check to DRF and drf-spectacular still documents the DRF view.
+    dispatch.__dict__.update(view.__dict__)
+    return dispatch
@@ -0,0 +1,350 @@
+"""Two-tier cache: an in-process LRU in front of the shared Django cache.
+
+Entries live in the shared cache (``CACHES["default"]``, configured from
+``CACHE_URL``) and are copied into a per-process LRU for at most
+``LOCAL_CACHE_TIMEOUT`` seconds, so hot keys (catalogs, the next event) are
+served without a round trip to the cache server. A delete or version bump
+reaches the local copies held by other processes only once they expire, so
+that timeout bounds how stale another node can be; per-user data that must
+read its own writes (profiles, authenticated users) stays in the shared cache
+alone, and is not cached at all unless ``is_shared_cache()``. When the shared
+cache is itself in-process (``LocMemCache``) the local tier is skipped.
+
+Keys belong to a ``CacheNamespace`` whose version is kept in the shared cache;
+``invalidate()`` replaces it, which orphans every key of the namespace at once.
+Versions are random rather than a counter, so a version key that gets evicted
+is not recreated with a value whose entries may still be cached.
+
+``get_or_set`` protects against stampedes: on a miss only the caller holding
+an ``add``-based lock in the shared cache computes the value while the others
+wait for it, and a hit is recomputed early with a probability that grows as it
+nears expiry (XFetch), so one caller refreshes a hot key before it expires
+instead of every caller after.
+"""
+
+import asyncio
+import math
+import random
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from functools import cache, wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+
+MISSING = object()
+# XFetch's beta; above 1 favours earlier recomputation.
+EARLY_RECOMPUTE_BETA = 1.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+class LocalLRU:
+    """Thread-safe in-process store bounded in size, with per-entry expiry."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        if timeout <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def is_shared_cache():
+    """Whether the default cache is seen by every process. A ``LocMemCache``
+    is per process, so a delete never reaches the copies the others hold."""
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+@cache
+def get_local():
+    """The process's local tier, or ``None`` when it would duplicate the shared
+    cache."""
+    if settings.LOCAL_CACHE_MAX_ENTRIES <= 0 or settings.LOCAL_CACHE_TIMEOUT <= 0:
+        return None
+    if isinstance(caches["default"], LocMemCache):
+        return None
+    return LocalLRU(settings.LOCAL_CACHE_MAX_ENTRIES)
+
+
+def _new_version():
+    return secrets.token_hex(8)
+
+
+def _should_recompute(entry):
+    _, expires, delta = entry
+    return (
+        time.time() - delta * EARLY_RECOMPUTE_BETA * math.log(1 - random.random())
+        >= expires
+    )
+
+
+class CacheNamespace:
+    """A versioned group of keys, e.g. ``CacheNamespace("participant:plans")``.
+
+    Values are stored as ``(value, expires, delta)`` where ``delta`` is how
+    long the value took to compute, which scales early recomputation. Timeouts
+    are in seconds; ``get_or_set`` also accepts a callable taking the computed
+    value, for entries whose lifetime depends on their content.
+    """
+
+    def __init__(self, name, local=True):
+        self.name = name
+        self.local = local
+        self.version_key = f"{name}:version"
+
+    @property
+    def shared(self):
+        return caches["default"]
+
+    def _local(self):
+        return get_local() if self.local else None
+
+    def _local_set(self, key, entry):
+        local = self._local()
+        if local is not None:
+            local.set(
+                key, entry, min(settings.LOCAL_CACHE_TIMEOUT, entry[1] - time.time())
+            )
+
+    def version(self):
+        local = self._local()
+        version = local.get(self.version_key) if local else MISSING
+        if version is MISSING:
+            version = self.shared.get(self.version_key)
+            if version is None:
+                version = _new_version()
+                if not self.shared.add(self.version_key, version, None):
+                    version = self.shared.get(self.version_key) or version
+            if local:
+                local.set(self.version_key, version, settings.LOCAL_CACHE_TIMEOUT)
+        return version
+
+    async def aversion(self):
+        local = self._local()
+        version = local.get(self.version_key) if local else MISSING
+        if version is MISSING:
+            version = await self.shared.aget(self.version_key)
+            if version is None:
+                version = _new_version()
+                if not await self.shared.aadd(self.version_key, version, None):
+                    version = await self.shared.aget(self.version_key) or version
+            if local:
+                local.set(self.version_key, version, settings.LOCAL_CACHE_TIMEOUT)
+        return version
+
+    def make_key(self, key, version):
+        return f"{self.name}:v{version}:{key}"
+
+    def _entry(self, value, timeout, delta):
+        if callable(timeout):
+            timeout = timeout(value)
+        return (value, time.time() + timeout, delta), timeout
+
+    def _get_entry(self, full_key):
+        local = self._local()
+        entry = local.get(full_key) if local else MISSING
+        if entry is MISSING:
+            entry = self.shared.get(full_key, MISSING)
+            if entry is not MISSING:
+                self._local_set(full_key, entry)
+        return entry
+
+    async def _aget_entry(self, full_key):
+        local = self._local()
+        entry = local.get(full_key) if local else MISSING
+        if entry is MISSING:
+            entry = await self.shared.aget(full_key, MISSING)
+            if entry is not MISSING:
+                self._local_set(full_key, entry)
+        return entry
+
+    def _store(self, full_key, value, timeout, delta=0):
+        entry, timeout = self._entry(value, timeout, delta)
+        self.shared.set(full_key, entry, timeout)
+        self._local_set(full_key, entry)
+        return value
+
+    async def _astore(self, full_key, value, timeout, delta=0):
+        entry, timeout = self._entry(value, timeout, delta)
+        await self.shared.aset(full_key, entry, timeout)
+        self._local_set(full_key, entry)
+        return value
+
+    def get(self, key, default=None):
+        entry = self._get_entry(self.make_key(key, self.version()))
+        return default if entry is MISSING else entry[0]
+
+    async def aget(self, key, default=None):
+        entry = await self._aget_entry(self.make_key(key, await self.aversion()))
+        return default if entry is MISSING else entry[0]
+
+    def set(self, key, value, timeout):
+        return self._store(self.make_key(key, self.version()), value, timeout)
+
+    async def aset(self, key, value, timeout):
+        return await self._astore(
+            self.make_key(key, await self.aversion()), value, timeout
+        )
+
+    def refresh(self, key, compute, timeout):
+        """Compute and store the value of ``key`` unconditionally."""
+        start = time.monotonic()
+        value = compute()
+        return self._store(
+            self.make_key(key, self.version()),
+            value,
+            timeout,
+            time.monotonic() - start,
+        )
+
+    def delete_many(self, keys):
+        """Delete ``keys`` from the shared cache and this process's local tier."""
+        version = self.version()
+        full_keys = [self.make_key(key, version) for key in keys]
+        self.shared.delete_many(full_keys)
+        local = self._local()
+        if local is not None:
+            for full_key in full_keys:
+                local.delete(full_key)
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def invalidate(self):
+        """Drop every key of the namespace by moving to a new version."""
+        self.shared.set(self.version_key, _new_version(), None)
+        local = self._local()
+        if local is not None:
+            local.delete(self.version_key)
+
+    def get_or_set(self, key, compute, timeout):
+        """Return the cached value of ``key``, computing it with ``compute()``
+        at most once across callers when it is missing or about to expire."""
+        full_key = self.make_key(key, self.version())
+        entry = self._get_entry(full_key)
+        if entry is not MISSING and not _should_recompute(entry):
+            return entry[0]
+        lock_key = f"{full_key}:lock"
+        if self.shared.add(lock_key, 1, settings.CACHE_LOCK_TIMEOUT):
+            try:
+                start = time.monotonic()
+                value = compute()
+                delta = time.monotonic() - start
+                return self._store(full_key, value, timeout, delta)
+            finally:
+                self.shared.delete(lock_key)
+        if entry is not MISSING:
+            # Another caller is refreshing it; the current value is still valid.
+            return entry[0]
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = self.shared.get(full_key, MISSING)
+            if entry is not MISSING:
+                return entry[0]
+        return self._store(full_key, compute(), timeout)
+
+    async def aget_or_set(self, key, compute, timeout):
+        """Async ``get_or_set``; ``compute`` is a coroutine function."""
+        full_key = self.make_key(key, await self.aversion())
+        entry = await self._aget_entry(full_key)
+        if entry is not MISSING and not _should_recompute(entry):
+            return entry[0]
+        lock_key = f"{full_key}:lock"
+        if await self.shared.aadd(lock_key, 1, settings.CACHE_LOCK_TIMEOUT):
+            try:
+                start = time.monotonic()
+                value = await compute()
+                delta = time.monotonic() - start
+                return await self._astore(full_key, value, timeout, delta)
+            finally:
+                await self.shared.adelete(lock_key)
+        if entry is not MISSING:
+            return entry[0]
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            entry = await self.shared.aget(full_key, MISSING)
+            if entry is not MISSING:
+                return entry[0]
+        return await self._astore(full_key, await compute(), timeout)
+
+
+def cached_queryset(namespace, key, queryset, timeout):
+    """Evaluate ``queryset`` (with its ``select_related``/``prefetch_related``)
+    once per ``timeout`` and return the cached list of results."""
+    return namespace.get_or_set(key, lambda: list(queryset), timeout)
+
+
+async def acached_queryset(namespace, key, queryset, timeout):
+    async def evaluate():
+        return [obj async for obj in queryset]
+
+    return await namespace.aget_or_set(key, evaluate, timeout)
+
+
+def cache_response(namespace, timeout):
+    """View decorator caching successful GET responses, headers included, per
+    URL and ``Accept`` header. Meant for public endpoints (cookies are not
+    kept); DRF responses are rendered first, so wrap the result of
+    ``as_view()``."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            key = f"{request.get_full_path()}|{request.headers.get('Accept', '')}"
+            response = None
+
+            def render():
+                nonlocal response
+                response = view(request, *args, **kwargs)
+                if hasattr(response, "render") and not response.is_rendered:
+                    response.render()
+                return response.status_code, response.content, list(response.items())
+
+            status, content, headers = namespace.get_or_set(key, render, timeout)
+            if status != 200:
+                namespace.delete(key)
+            if response is None:
+                response = HttpResponse(content, status=status)
+                for header, value in headers:
+                    response[header] = value
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,151 @@
+"""Password hashing offloaded to a bounded process pool.
+
+PBKDF2 is CPU bound and holds the GIL, so running it on the request thread pins
+the worker for the whole computation. The helpers below submit the work to a
+shared process pool instead. At most ``PASSWORD_HASHING_MAX_PENDING`` jobs may be
+in flight at once; further callers fail fast with a 503 instead of piling up,
+and every job is bounded by ``PASSWORD_HASHING_TIMEOUT`` seconds.
+
+Setting ``PASSWORD_HASHING_WORKERS`` to 0 disables the pool and hashes inline.
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PasswordHashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Server is busy, please try again later."
+    default_code = "password_hashing_unavailable"
+
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _init_worker():
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "AIA.settings")
+    django.setup()
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(
+                    settings.PASSWORD_HASHING_MAX_PENDING
+                )
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+    return _executor
+
+
+def _submit(fn, *args):
+    executor = _get_executor()
+    if not _slots.acquire(blocking=False):
+        raise PasswordHashingUnavailable()
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def _run(fn, *args):
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return fn(*args)
+    future = _submit(fn, *args)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASHING_TIMEOUT)
+    except FutureTimeoutError:
+        future.cancel()
+        raise PasswordHashingUnavailable()
+
+
+async def _arun(fn, *args):
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return await asyncio.to_thread(fn, *args)
+    future = _submit(fn, *args)
+    try:
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=settings.PASSWORD_HASHING_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        raise PasswordHashingUnavailable()
+
+
+def _must_update(encoded):
+    preferred = hashers.get_hasher("default")
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def make_password(raw_password):
+    return _run(hashers.make_password, raw_password)
+
+
+def check_password(raw_password, encoded):
+    return _run(hashers.check_password, raw_password, encoded)
+
+
+async def amake_password(raw_password):
+    return await _arun(hashers.make_password, raw_password)
+
+
+async def acheck_password(raw_password, encoded):
+    return await _arun(hashers.check_password, raw_password, encoded)
+
+
+def set_password(user, raw_password):
+    """Pool-backed equivalent of ``User.set_password``."""
+    user.password = make_password(raw_password)
+    user._password = raw_password
+
+
+async def aset_password(user, raw_password):
+    user.password = await amake_password(raw_password)
+    user._password = raw_password
+
+
+def check_user_password(user, raw_password):
+    """Pool-backed equivalent of ``User.check_password``.
+
+    Like Django's implementation, a valid password stored with an outdated
+    hasher or iteration count is transparently re-hashed and saved.
+    """
+    valid = check_password(raw_password, user.password)
+    if valid and _must_update(user.password):
+        set_password(user, raw_password)
+        user.save(update_fields=["password"])
+    return valid
+
+
+async def acheck_user_password(user, raw_password):
+    valid = await acheck_password(raw_password, user.password)
+    if valid and _must_update(user.password):
+        await aset_password(user, raw_password)
+        await user.asave(update_fields=["password"])
+    return valid
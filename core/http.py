@@ -0,0 +1,54 @@
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+
+def conditional_get(validators, max_age=None):
+    """Decorator (for ``method_decorator``) adding ETag/Last-Modified, 304
+    responses and a public ``Cache-Control`` header to a read endpoint.
+
+    ``validators(request, *args, **kwargs)`` returns ``(version, last_modified)``
+    or ``None`` when there is nothing to validate. It should be cheap (an
+    aggregate, a cache read) since it runs before the view on every request;
+    the result is computed once and reused for both headers.
+
+    For async views ``validators`` may be a coroutine function; it is awaited
+    before the view runs, so the synchronous ``condition`` checks only read
+    its stored result.
+    """
+    if max_age is None:
+        max_age = settings.PUBLIC_CACHE_MAX_AGE
+
+    def get_validators(request, *args, **kwargs):
+        if not hasattr(request, "_conditional_validators"):
+            request._conditional_validators = validators(request, *args, **kwargs)
+        return request._conditional_validators
+
+    def etag(request, *args, **kwargs):
+        result = get_validators(request, *args, **kwargs)
+        if result is None:
+            return None
+        return hashlib.md5(str(result[0]).encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        result = get_validators(request, *args, **kwargs)
+        return result[1] if result else None
+
+    def decorator(view):
+        view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+        view = cache_control(public=True, max_age=max_age)(view)
+        if not iscoroutinefunction(validators):
+            return view
+
+        @wraps(view)
+        async def async_view(request, *args, **kwargs):
+            request._conditional_validators = await validators(request, *args, **kwargs)
+            return await view(request, *args, **kwargs)
+
+        return async_view
+
+    return decorator
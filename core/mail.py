@@ -0,0 +1,98 @@
+"""Durable email outbox.
+
+Request handlers call ``enqueue_email`` which only inserts an ``OutgoingEmail``
+row, so a slow or unavailable mail provider never blocks a request. The
+``send_outbox`` management command drains due rows in batches over a single
+SMTP connection, retrying failures with exponential backoff and marking a
+message dead once it runs out of attempts.
+"""
+
+from datetime import timedelta
+
+from core.models import OutgoingEmail
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 3600
+
+
+def enqueue_email(subject, body, to, headers=None, from_email=None):
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.SERVER_EMAIL,
+        to=list(to),
+        headers=headers or {},
+    )
+
+
+def _to_message(email, connection):
+    return EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        headers=email.headers,
+        connection=connection,
+    )
+
+
+def _record_failure(email, exc, max_attempts):
+    email.last_error = repr(exc)
+    if email.attempts >= max_attempts:
+        email.status = "D"
+    else:
+        delay = min(BACKOFF_SECONDS * 2 ** (email.attempts - 1), MAX_BACKOFF_SECONDS)
+        email.next_attempt_time = timezone.now() + timedelta(seconds=delay)
+
+
+def send_outbox_batch(batch_size=50, max_attempts=MAX_ATTEMPTS):
+    """Send up to ``batch_size`` due messages; return ``(sent, failed)``.
+
+    The claimed rows stay locked (``skip_locked``) until the batch is written
+    back, so several workers can drain the outbox concurrently.
+    """
+    sent = failed = 0
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status="P", next_attempt_time__lte=timezone.now())
+            .order_by("next_attempt_time")[:batch_size]
+        )
+        if not emails:
+            return sent, failed
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as exc:
+            for email in emails:
+                email.attempts += 1
+                _record_failure(email, exc, max_attempts)
+            failed = len(emails)
+        else:
+            try:
+                for email in emails:
+                    email.attempts += 1
+                    try:
+                        connection.send_messages([_to_message(email, connection)])
+                    except Exception as exc:
+                        failed += 1
+                        _record_failure(email, exc, max_attempts)
+                    else:
+                        sent += 1
+                        email.status = "S"
+                        email.sent_time = timezone.now()
+                        email.last_error = ""
+            finally:
+                connection.close()
+
+        OutgoingEmail.objects.bulk_update(
+            emails,
+            ["status", "attempts", "next_attempt_time", "last_error", "sent_time"],
+        )
+    return sent, failed
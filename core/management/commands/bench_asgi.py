@@ -0,0 +1,160 @@
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test GET endpoints through Django's ASGI and WSGI handlers in "
+        "process and report throughput and p50/p99 latency per concurrency "
+        "level. WSGI requests run on a thread pool as large as the concurrency "
+        "(like threaded workers); ASGI requests run as tasks on one event loop. "
+        "Run with ASYNC_READ_VIEWS=True to measure the async read views."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", default=["/api/core/next-event/"])
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", default="1,10,50")
+        parser.add_argument(
+            "--user", help="Email of the user to send a bearer token for"
+        )
+        parser.add_argument("--host", default="localhost")
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options["concurrency"].split(",")]
+        except ValueError:
+            raise CommandError("--concurrency must be comma-separated integers.")
+        headers = {"host": options["host"]}
+        if options["user"]:
+            user = User.objects.filter(email__iexact=options["user"]).first()
+            if user is None:
+                raise CommandError(f"No user with email {options['user']}.")
+            headers["authorization"] = f"Bearer {AccessToken.for_user(user)}"
+
+        wsgi, asgi = get_wsgi_application(), get_asgi_application()
+        for path in options["paths"]:
+            # Warm the caches the endpoint reads, outside the timing.
+            self.wsgi_request(wsgi, path, headers)
+            for concurrency in levels:
+                for label, run, application in (
+                    ("WSGI", self.run_wsgi, wsgi),
+                    ("ASGI", self.run_asgi, asgi),
+                ):
+                    start = time.perf_counter()
+                    results = run(
+                        application, path, headers, options["requests"], concurrency
+                    )
+                    self.report(label, path, concurrency, results, start)
+
+    def report(self, label, path, concurrency, results, start):
+        elapsed = time.perf_counter() - start
+        latencies = sorted(latency for _, latency in results)
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        errors = sum(1 for status, _ in results if status not in (200, 304))
+        self.stdout.write(
+            f"{label} c={concurrency:<4} {path}: {len(results)} requests in "
+            f"{elapsed:.3f}s ({len(results) / elapsed:,.0f}/s), "
+            f"p50 {percentiles[49] * 1000:.1f}ms, p99 {percentiles[98] * 1000:.1f}ms, "
+            f"{errors} errors"
+        )
+
+    def wsgi_request(self, application, path, headers):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "SCRIPT_NAME": "",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": headers["host"],
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers.items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+        status = []
+        start = time.perf_counter()
+        body = application(environ, lambda line, _: status.append(int(line[:3])))
+        try:
+            for _ in body:
+                pass
+        finally:
+            body.close()
+        return status[0], time.perf_counter() - start
+
+    def run_wsgi(self, application, path, headers, requests, concurrency):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(self.wsgi_request, application, path, headers)
+                for _ in range(requests)
+            ]
+            return [future.result() for future in futures]
+
+    async def asgi_request(self, application, path, headers):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [
+                (name.encode(), value.encode()) for name, value in headers.items()
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": (headers["host"], 80),
+        }
+        status = []
+        body_sent = False
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # The client never disconnects; Django cancels this wait once the
+            # response is sent.
+            await asyncio.Future()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        start = time.perf_counter()
+        await application(scope, receive, send)
+        return status[0], time.perf_counter() - start
+
+    def run_asgi(self, application, path, headers, requests, concurrency):
+        async def worker(remaining, results):
+            while remaining:
+                remaining.pop()
+                results.append(await self.asgi_request(application, path, headers))
+
+        async def run():
+            remaining, results = list(range(requests)), []
+            await asyncio.gather(
+                *(worker(remaining, results) for _ in range(concurrency))
+            )
+            return results
+
+        return asyncio.run(run())
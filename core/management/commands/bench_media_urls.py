@@ -0,0 +1,43 @@
+import time
+
+from core.storage import CachedURLS3Storage
+from django.core.management.base import BaseCommand
+from storages.backends.s3boto3 import S3Boto3Storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare media URL generation throughput of S3Boto3Storage and "
+        "CachedURLS3Storage. Signing is local, so no bucket is needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keys", type=int, default=200)
+        parser.add_argument("--rounds", type=int, default=20)
+        parser.add_argument("--custom-domain", default=None)
+
+    def handle(self, *args, **options):
+        credentials = {
+            "access_key": "benchmark",
+            "secret_key": "benchmark",
+            "bucket_name": "benchmark",
+            "endpoint_url": "https://s3.example.com",
+            "custom_domain": options["custom_domain"],
+        }
+        names = [f"participants/{i}.jpg" for i in range(options["keys"])]
+        for label, storage_class in (
+            ("S3Boto3Storage", S3Boto3Storage),
+            ("CachedURLS3Storage", CachedURLS3Storage),
+        ):
+            storage = storage_class(**credentials)
+            storage.url(names[0])  # build the boto3 client outside the timing
+            start = time.perf_counter()
+            for _ in range(options["rounds"]):
+                for name in names:
+                    storage.url(name)
+            elapsed = time.perf_counter() - start
+            calls = options["rounds"] * len(names)
+            self.stdout.write(
+                f"{label}: {calls} urls in {elapsed:.3f}s "
+                f"({calls / elapsed:,.0f}/s)"
+            )
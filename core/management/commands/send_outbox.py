@@ -0,0 +1,36 @@
+import time
+
+from core.mail import MAX_ATTEMPTS, send_outbox_batch
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Send pending emails from the outbox in batches over one connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is drained.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls when the outbox is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_outbox_batch(
+                batch_size=options["batch_size"],
+                max_attempts=options["max_attempts"],
+            )
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,60 @@
+import logging
+
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Lower, Trim
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_and_deduplicate_emails(apps, schema_editor):
+    """Lower-case every stored email and release duplicates before the unique
+    index is built.
+
+    For each group of accounts sharing an address (case-insensitively) the most
+    recently active one keeps it; the others get a blank email so no account is
+    deleted, and their ids are logged for auditing. Blank emails are excluded
+    from the unique index.
+    """
+    User = apps.get_model("auth", "User")
+    User.objects.exclude(email="").update(email=Lower(Trim("email")))
+
+    keepers = {}
+    duplicates = []
+    users = (
+        User.objects.exclude(email="")
+        .order_by("email", F("last_login").desc(nulls_last=True), "-date_joined")
+        .values_list("id", "email")
+    )
+    for user_id, email in users.iterator():
+        if email in keepers:
+            duplicates.append(user_id)
+            logger.warning(
+                "Blanking the email of user %s, which user %s keeps",
+                user_id,
+                keepers[email],
+            )
+        else:
+            keepers[email] = user_id
+    User.objects.filter(id__in=duplicates).update(email="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_alter_event_starting_date"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            normalize_and_deduplicate_emails, migrations.RunPython.noop
+        ),
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX auth_user_email_uniq "
+                "ON auth_user (email) WHERE email <> ''"
+            ),
+            reverse_sql="DROP INDEX auth_user_email_uniq",
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_user_email_unique"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="DROP INDEX auth_user_email_uniq",
+            reverse_sql=(
+                "CREATE UNIQUE INDEX auth_user_email_uniq "
+                "ON auth_user (email) WHERE email <> ''"
+            ),
+        ),
+        # 0003 already lower-cased and deduplicated the stored emails.
+        migrations.RunPython(migrations.RunPython.noop, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX auth_user_email_lower_uniq "
+                "ON auth_user (LOWER(email)) WHERE email <> ''"
+            ),
+            reverse_sql="DROP INDEX auth_user_email_lower_uniq",
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_outgoingemail"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="event",
+            name="starting_date",
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_event_starting_date_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="updated_time",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
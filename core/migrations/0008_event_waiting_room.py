@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_event_updated_time"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="admission_rate",
+            field=models.PositiveIntegerField(
+                default=50,
+                help_text="Users admitted per second while the waiting room is on.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="waiting_room_enabled",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:43
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def raise_zero_admission_rates(apps, schema_editor):
+    Event = apps.get_model("core", "Event")
+    Event.objects.filter(admission_rate=0).update(admission_rate=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_event_waiting_room"),
+    ]
+
+    operations = [
+        migrations.RunPython(raise_zero_admission_rates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="event",
+            name="admission_rate",
+            field=models.PositiveIntegerField(
+                default=50,
+                help_text="Users admitted per second while the waiting room is on.",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
@@ -1,24 +1,83 @@
+from core import hashing
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def filter_by_email(queryset, email, field="email"):
+    """Filter on ``LOWER(field)`` so the lookup is served by the partial unique
+    ``auth_user_email_lower_uniq`` index instead of a table scan. The ``<> ''``
+    term repeats the index predicate so planners will pick the index."""
+    return queryset.alias(email_lower=Lower(field)).filter(
+        ~models.Q(**{field: ""}), email_lower=normalize_email(email)
+    )
 
 
 class EmailModelBackend(ModelBackend):
     def authenticate(self, request, email=None, password=None, **kwargs):
         user_model = get_user_model()
         try:
-            user = user_model.objects.get(email=email)
+            user = filter_by_email(user_model.objects, email).get()
         except user_model.DoesNotExist:
             return None
         else:
-            if user.check_password(password):
+            if hashing.check_user_password(user, password):
+                return user
+        return None
+
+    async def aauthenticate(self, request, email=None, password=None, **kwargs):
+        user_model = get_user_model()
+        try:
+            user = await filter_by_email(user_model.objects, email).aget()
+        except user_model.DoesNotExist:
+            return None
+        else:
+            if await hashing.acheck_user_password(user, password):
                 return user
         return None
 
 
 class Event(models.Model):
     name = models.CharField(max_length=50)
-    starting_date = models.DateTimeField()
+    starting_date = models.DateTimeField(db_index=True)
+    waiting_room_enabled = models.BooleanField(default=False)
+    admission_rate = models.PositiveIntegerField(
+        default=50,
+        validators=[MinValueValidator(1)],
+        help_text="Users admitted per second while the waiting room is on.",
+    )
+    updated_time = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
+
+
+class OutgoingEmail(models.Model):
+    """Outbox row written by request paths and drained by ``manage.py send_outbox``."""
+
+    STATUS_CHOICES = (("P", "Pending"), ("S", "Sent"), ("D", "Dead"))
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    headers = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=1, default="P", choices=STATUS_CHOICES)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_time = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_time = models.DateTimeField(auto_now_add=True)
+    sent_time = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)}"
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_time"])]
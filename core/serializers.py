@@ -34,6 +34,8 @@ class CustomTokenObtainPairSerializer(serializers.Serializer):
 
 
 class EventSerializer(serializers.ModelSerializer):
+    """Public view of an event; the waiting room settings are admin-only."""
+
     class Meta:
         model = Event
-        fields = "__all__"
+        fields = ("id", "name", "starting_date")
@@ -0,0 +1,10 @@
+from core.models import Event
+from core.views import NEXT_EVENT_CACHE_KEY, next_event_cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_next_event(sender, instance, **kwargs):
+    transaction.on_commit(lambda: next_event_cache.delete(NEXT_EVENT_CACHE_KEY))
@@ -0,0 +1,64 @@
+"""S3 storage that memoizes generated media URLs.
+
+Building a URL with ``S3Boto3Storage.url()`` goes through botocore's presigner
+for every file, which adds up on listings that show many participants. Plain
+CDN URLs (``AWS_S3_CUSTOM_DOMAIN`` without a CloudFront signer) are cheap string
+formatting and are returned as is. Every other URL is cached per key in
+process for ``MEDIA_URL_CACHE_TIMEOUT`` seconds, which must stay below
+``AWS_QUERYSTRING_EXPIRE`` so a URL handed out from the cache is still valid
+for at least the difference.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from storages.backends.s3boto3 import S3Boto3Storage
+
+MAX_CACHED_URLS = 10_000
+
+
+class CachedURLS3Storage(S3Boto3Storage):
+    def __init__(self, **settings_overrides):
+        super().__init__(**settings_overrides)
+        self.url_cache_timeout = settings.MEDIA_URL_CACHE_TIMEOUT
+        if self.querystring_auth and self.url_cache_timeout >= self.querystring_expire:
+            raise ImproperlyConfigured(
+                "MEDIA_URL_CACHE_TIMEOUT must be lower than AWS_QUERYSTRING_EXPIRE."
+            )
+        self._urls = {}
+        self._lock = threading.Lock()
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        if parameters or expire is not None or http_method:
+            return super().url(name, parameters, expire, http_method)
+        if self.custom_domain and not self.cloudfront_signer:
+            return super().url(name)
+
+        now = time.monotonic()
+        with self._lock:
+            url, expires = self._urls.get(name, (None, 0))
+        if url is not None and expires > now:
+            return url
+
+        url = super().url(name)
+        with self._lock:
+            self._urls[name] = (url, now + self.url_cache_timeout)
+            if len(self._urls) > MAX_CACHED_URLS:
+                self._purge(now)
+        return url
+
+    def delete(self, name):
+        with self._lock:
+            self._urls.pop(name, None)
+        super().delete(name)
+
+    def _purge(self, now):
+        self._urls = {
+            name: (url, expires)
+            for name, (url, expires) in self._urls.items()
+            if expires > now
+        }
+        if len(self._urls) > MAX_CACHED_URLS:
+            self._urls.clear()
@@ -0,0 +1,55 @@
+"""Helpers shared by the apps' ``tests.py`` modules."""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Admin pages link static files, which the manifest storage needs collected.
+ADMIN_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Rows per model in the tests that need more than one.
+ROWS = 3
+
+
+@override_settings(STORAGES=ADMIN_STORAGES)
+class ChangelistQueryTestCase(TestCase):
+    """Render an app's admin changelists with one row and with ``ROWS`` rows per
+    model and check both take the same number of queries, at most the pinned
+    ceiling. Subclasses set ``app_label`` and implement ``create_row``."""
+
+    app_label = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.rows = 0
+
+    def create_row(self, i):
+        """Create the ``i``-th row of every model the tests list."""
+        raise NotImplementedError
+
+    def count_changelist_queries(self, model):
+        url = reverse(f"admin:{self.app_label}_{model}_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertChangelistQueries(self, model, ceiling):
+        counts = {}
+        for rows in (1, ROWS):
+            while self.rows < rows:
+                self.create_row(self.rows)
+                self.rows += 1
+            counts[rows] = self.count_changelist_queries(model)
+        self.assertEqual(counts[1], counts[ROWS], f"{model}: queries per row count")
+        self.assertLessEqual(counts[ROWS], ceiling, f"{model}: queries")
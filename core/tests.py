@@ -0,0 +1,57 @@
+from core.cache import CacheNamespace, cache_response
+from core.models import Event, OutgoingEmail
+from core.testing import ChangelistQueryTestCase
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.utils import timezone
+
+
+class AdminChangelistQueryTests(ChangelistQueryTestCase):
+    app_label = "core"
+
+    def create_row(self, i):
+        Event.objects.create(name=f"AIA {i}", starting_date=timezone.now())
+        OutgoingEmail.objects.create(
+            subject=f"Mail {i}",
+            body="Hello",
+            from_email="aia@example.com",
+            to=[f"p{i}@example.com"],
+        )
+
+    def test_event(self):
+        self.assertChangelistQueries("event", 5)
+
+    def test_outgoingemail(self):
+        self.assertChangelistQueries("outgoingemail", 4)
+
+
+class CacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.namespace = CacheNamespace("tests:cache")
+
+    def test_cached_response_keeps_headers(self):
+        calls = []
+
+        @cache_response(self.namespace, 60)
+        def view(request):
+            calls.append(request)
+            response = HttpResponse(b"{}", content_type="application/json; version=2")
+            response["ETag"] = '"abc"'
+            response["Vary"] = "Accept"
+            return response
+
+        first = view(RequestFactory().get("/schema/"))
+        second = view(RequestFactory().get("/schema/"))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second.content, first.content)
+        for header in ("Content-Type", "ETag", "Vary"):
+            self.assertEqual(second[header], first[header])
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        self.namespace.set("key", "old", 60)
+        self.namespace.invalidate()
+        self.namespace.set("key", "new", 60)
+        cache.delete(self.namespace.version_key)
+        self.assertIsNone(self.namespace.get("key"))
@@ -0,0 +1,33 @@
+"""Text normalization for search columns.
+
+Persian text reaches us in several encodings of the same word: Arabic yeh and
+kaf instead of the Persian letters, zero-width non-joiners in place of spaces,
+tatweel and diacritics, and Persian or Arabic-Indic digits in codes and phone
+numbers. ``normalize_search_text`` folds all of these (and case) so the
+stored column and the query compare equal.
+"""
+
+import re
+
+PERSIAN_TRANSLATION = str.maketrans(
+    {
+        "\u064a": "\u06cc",  # Arabic yeh -> Persian yeh
+        "\u0649": "\u06cc",  # alef maksura -> Persian yeh
+        "\u0643": "\u06a9",  # Arabic kaf -> Persian kaf
+        "\u0629": "\u0647",  # teh marbuta -> heh
+        "\u0623": "\u0627",  # alef with hamza above -> alef
+        "\u0625": "\u0627",  # alef with hamza below -> alef
+        "\u200c": " ",  # zero-width non-joiner
+        "\u200f": None,  # right-to-left mark
+        "\u0640": None,  # tatweel
+        **{chr(0x06F0 + i): str(i) for i in range(10)},  # Persian digits
+        **{chr(0x0660 + i): str(i) for i in range(10)},  # Arabic-Indic digits
+    }
+)
+DIACRITICS = re.compile("[\u064b-\u0652\u0670]")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_search_text(text):
+    text = DIACRITICS.sub("", (text or "").translate(PERSIAN_TRANSLATION))
+    return WHITESPACE.sub(" ", text).strip().lower()
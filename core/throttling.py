@@ -0,0 +1,195 @@
+"""Sliding-window throttles for the unauthenticated, expensive endpoints.
+
+Each request is counted in a fixed window and the previous window's count is
+weighted by how much of it still overlaps the sliding window, which gives a
+smooth limit with two counters per key. Views opt in with ``throttle_scope``;
+the limits per scope and key kind live in ``AUTH_THROTTLE_RATES``. The counters
+are kept in a pluggable store selected by ``AUTH_THROTTLE_STORE``:
+``LocalThrottleStore`` for a single node, ``CacheThrottleStore`` to share the
+counters between nodes through a Django cache.
+
+Throttles run in ``APIView.initial``, so a rejected request never reaches the
+password hashing or email sending in the handler.
+"""
+
+import hashlib
+import threading
+import time
+from functools import cache
+
+from core.models import normalize_email
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """Turn ``"5/min"`` into ``(5, 60)``."""
+    num, period = rate.split("/")
+    return int(num), DURATIONS[period[0]]
+
+
+class LocalThrottleStore:
+    """In-process counters; only suitable when a single process serves traffic."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.time()
+        result = {}
+        with self._lock:
+            for key in keys:
+                value, expires = self._data.get(key, (None, None))
+                if value is not None and (expires is None or expires > now):
+                    result[key] = value
+        return result
+
+    def incr(self, key, timeout=None):
+        now = time.time()
+        with self._lock:
+            value, expires = self._data.get(key, (0, None))
+            if expires is not None and expires <= now:
+                value = 0
+            expires = now + timeout if timeout else None
+            self._data[key] = (value + 1, expires)
+            if len(self._data) > 10_000:
+                self._purge(now)
+            return value + 1
+
+    def _purge(self, now):
+        self._data = {
+            key: (value, expires)
+            for key, (value, expires) in self._data.items()
+            if expires is None or expires > now
+        }
+
+
+class CacheThrottleStore:
+    """Counters kept in a Django cache so every node shares them."""
+
+    def __init__(self, alias="default"):
+        self.cache = caches[alias]
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def incr(self, key, timeout=None, delta=1):
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key, delta)
+        except ValueError:
+            self.cache.set(key, delta, timeout)
+            return delta
+
+    def add(self, key, value, timeout=None):
+        return self.cache.add(key, value, timeout)
+
+
+@cache
+def get_store():
+    return import_string(settings.AUTH_THROTTLE_STORE)()
+
+
+def stats_key(scope, kind, outcome):
+    return f"throttle-stats:{scope}:{kind}:{outcome}"
+
+
+def get_stats():
+    """Allowed/rejected counters per scope and key kind, with the configured rate."""
+    rates = settings.AUTH_THROTTLE_RATES
+    keys = [
+        stats_key(scope, kind, outcome)
+        for scope, kinds in rates.items()
+        for kind in kinds
+        for outcome in ("allowed", "rejected")
+    ]
+    counters = get_store().get_many(keys)
+    return {
+        scope: {
+            kind: {
+                "rate": rate,
+                "allowed": counters.get(stats_key(scope, kind, "allowed"), 0),
+                "rejected": counters.get(stats_key(scope, kind, "rejected"), 0),
+            }
+            for kind, rate in kinds.items()
+        }
+        for scope, kinds in rates.items()
+    }
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    kind = None
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        rate = settings.AUTH_THROTTLE_RATES.get(scope, {}).get(self.kind)
+        if not rate:
+            return True
+        ident = self.get_ident_value(request)
+        if not ident:
+            return True
+
+        limit, window = parse_rate(rate)
+        store = get_store()
+        digest = hashlib.sha1(ident.encode()).hexdigest()
+        now = time.time()
+        current = int(now // window)
+        current_key = f"throttle:{scope}:{self.kind}:{digest}:{current}"
+        previous_key = f"throttle:{scope}:{self.kind}:{digest}:{current - 1}"
+        counts = store.get_many([current_key, previous_key])
+        current_count = counts.get(current_key, 0)
+        previous_count = counts.get(previous_key, 0)
+
+        elapsed = now - current * window
+        weight = (window - elapsed) / window
+        if previous_count * weight + current_count >= limit:
+            if current_count >= limit or not previous_count:
+                self.wait_seconds = window - elapsed
+            else:
+                free_at = window - (limit - current_count) * window / previous_count
+                self.wait_seconds = max(free_at - elapsed, 1)
+            store.incr(stats_key(scope, self.kind, "rejected"))
+            return False
+
+        store.incr(current_key, timeout=2 * window)
+        store.incr(stats_key(scope, self.kind, "allowed"))
+        return True
+
+    def wait(self):
+        return getattr(self, "wait_seconds", None)
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Keys on the client IP: ``REMOTE_ADDR``, or the address ``NUM_PROXIES``
+    hops from the end of X-Forwarded-For, which clients cannot forge."""
+
+    kind = "ip"
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(SlidingWindowThrottle):
+    """Keys on the submitted email (``email`` or sign-up's ``user.email``)."""
+
+    kind = "email"
+
+    def get_ident_value(self, request):
+        data = request.data
+        if not hasattr(data, "get"):
+            return None
+        email = data.get("email")
+        user = data.get("user")
+        if not email and isinstance(user, dict):
+            email = user.get("email")
+        if not isinstance(email, str):
+            return None
+        return normalize_email(email)
@@ -1,4 +1,5 @@
 from core import views
+from core.async_views import async_reads
 from django.urls import path
 
 urlpatterns = [
@@ -8,5 +9,12 @@ urlpatterns = [
     path(
         "sign-in/refresh/", views.CustomTokenRefreshView.as_view(), name="token_refresh"
     ),
-    path("next-event/", views.NextEventAPIView.as_view(), name="next-event"),
+    path(
+        "next-event/",
+        async_reads(views.NextEventAPIView, views.read_next_event),
+        name="next-event",
+    ),
+    path(
+        "throttle-stats/", views.ThrottleStatsAPIView.as_view(), name="throttle-stats"
+    ),
 ]
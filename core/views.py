@@ -1,3 +1,7 @@
+from core import throttling
+from core.async_views import json_response
+from core.cache import CacheNamespace
+from core.http import conditional_get
 from core.models import Event
 from core.serializers import (
     CustomTokenObtainPairSerializer,
@@ -5,17 +9,100 @@ from core.serializers import (
     TokenRefreshRequestSerializer,
     TokenRefreshResponseSerializer,
 )
+from django.conf import settings
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenRefreshView
 
+next_event_cache = CacheNamespace("core:next-event")
+NEXT_EVENT_CACHE_KEY = "entry"
+
+
+def next_event_timeout(entry):
+    """Cache the next event until it starts and at most NEXT_EVENT_CACHE_TIMEOUT
+    seconds, so the endpoint rolls over on its own."""
+    timeout = settings.NEXT_EVENT_CACHE_TIMEOUT
+    if entry:
+        starts_in = entry["starting_date"] - timezone.now()
+        timeout = min(timeout, starts_in.total_seconds())
+    return timeout
+
+
+def next_event_queryset():
+    return Event.objects.filter(starting_date__gt=timezone.now()).order_by(
+        "starting_date"
+    )
+
+
+def next_event_entry(event):
+    """What is cached for the next event: its public data, plus the dates the
+    cache timeout and the HTTP validators need, which are not all public."""
+    if event is None:
+        return None
+    return {
+        "data": EventSerializer(event).data,
+        "starting_date": event.starting_date,
+        "updated_time": event.updated_time,
+    }
+
+
+def get_next_event():
+    """Cached ``next_event_entry`` of the next event, or ``None``."""
+    return next_event_cache.get_or_set(
+        NEXT_EVENT_CACHE_KEY,
+        lambda: next_event_entry(next_event_queryset().first()),
+        next_event_timeout,
+    )
+
+
+async def aget_next_event():
+    """Async ``get_next_event``."""
+
+    async def load():
+        return next_event_entry(await next_event_queryset().afirst())
+
+    return await next_event_cache.aget_or_set(
+        NEXT_EVENT_CACHE_KEY, load, next_event_timeout
+    )
+
+
+def get_next_event_data():
+    """Serialized next event, or ``None``."""
+    entry = get_next_event()
+    return entry["data"] if entry else None
+
+
+async def aget_next_event_data():
+    """Async ``get_next_event_data``."""
+    entry = await aget_next_event()
+    return entry["data"] if entry else None
+
+
+def next_event_validators(request, *args, **kwargs):
+    entry = get_next_event()
+    if not entry:
+        return None
+    updated_time = entry["updated_time"]
+    return (entry["data"]["id"], updated_time.isoformat()), updated_time
+
+
+async def anext_event_validators(request, *args, **kwargs):
+    entry = await aget_next_event()
+    if not entry:
+        return None
+    updated_time = entry["updated_time"]
+    return (entry["data"]["id"], updated_time.isoformat()), updated_time
+
 
 class EmailTokenObtainPairView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [throttling.IPRateThrottle, throttling.EmailRateThrottle]
+    throttle_scope = "sign-in"
 
     @extend_schema(
         request=CustomTokenObtainPairSerializer,
@@ -30,6 +117,7 @@ class EmailTokenObtainPairView(APIView):
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
+@method_decorator(conditional_get(next_event_validators), name="get")
 class NextEventAPIView(APIView):
     permission_classes = [AllowAny]
 
@@ -38,17 +126,32 @@ class NextEventAPIView(APIView):
         description="Return the nearest upcoming event (starting_date > now)",
     )
     def get(self, request, *args, **kwargs):
-        event = (
-            Event.objects.filter(starting_date__gt=timezone.now())
-            .order_by("starting_date")
-            .first()
-        )
-        if not event:
+        data = get_next_event_data()
+        if not data:
             return Response(
                 {"detail": "No upcoming event found."}, status=status.HTTP_404_NOT_FOUND
             )
-        serializer = EventSerializer(event, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+@conditional_get(anext_event_validators)
+async def read_next_event(request):
+    """ASGI-native GET of ``NextEventAPIView``."""
+    data = await aget_next_event_data()
+    if not data:
+        return json_response({"detail": "No upcoming event found."}, status=404)
+    return json_response(data)
+
+
+class ThrottleStatsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses={200: dict},
+        description="Allowed/rejected counters and configured rates per throttle",
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(throttling.get_stats(), status=status.HTTP_200_OK)
 
 
 class CustomTokenRefreshView(TokenRefreshView):
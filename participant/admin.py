@@ -1,21 +1,115 @@
-from django.contrib import admin
+from core.pagination import EstimatedCountPaginator
+from django import forms
+from django.contrib import admin, messages
+from django.http import HttpResponseRedirect
+from participant.export import export_participations
 from participant.models import (
+    Announcement,
     ModeOfAttendance,
     Participant,
     ParticipantInfo,
     Participation,
     ParticipationPlan,
+    PlanFullError,
+    PlanStats,
 )
+from participant.search import search_participants
 
 
-class ParticipationAdmin(admin.ModelAdmin):
+class ParticipantSearchMixin:
+    """Search the normalized ``Participant.search_text`` column instead of
+    ``icontains`` scans over ``search_fields`` (which only show the box)."""
+
+    participant_path = ""
+    # Set when participant_path follows a reverse relation.
+    search_may_have_duplicates = False
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        queryset = search_participants(queryset, search_term, self.participant_path)
+        return queryset, self.search_may_have_duplicates
+
+
+def plans_with_labels():
+    # ParticipationPlan.__str__ reads the event and the mode of attendance.
+    return ParticipationPlan.objects.select_related("event", "mode_of_attendance")
+
+
+class PlanListFilter(admin.RelatedFieldListFilter):
+    def field_choices(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        return [
+            (plan.pk, str(plan)) for plan in plans_with_labels().order_by(*ordering)
+        ]
+
+
+class PlanChoiceMixin:
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == "plan":
+            kwargs["queryset"] = plans_with_labels()
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class ParticipationAdminForm(forms.ModelForm):
+    def clean(self):
+        cleaned_data = super().clean()
+        plan = cleaned_data.get("plan")
+        if (
+            self.instance._state.adding
+            and plan is not None
+            and plan.capacity is not None
+            and plan.reserved_count >= plan.capacity
+        ):
+            self.add_error("plan", "This plan is full.")
+        return cleaned_data
+
+
+class ParticipationAdmin(ParticipantSearchMixin, PlanChoiceMixin, admin.ModelAdmin):
+    form = ParticipationAdminForm
     list_display = ("participant", "plan", "created_time")
     list_filter = (
-        "plan",
+        "plan__event",
+        ("plan", PlanListFilter),
         "plan__mode_of_attendance",
         "plan__mode_of_attendance__has_lunch",
     )
+    list_select_related = (
+        "participant__user",
+        "participant__info",
+        "plan__event",
+        "plan__mode_of_attendance",
+    )
     search_fields = ("participant__user__email",)
+    participant_path = "participant__"
+    autocomplete_fields = ("participant",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ("export_csv", "export_xlsx")
+
+    @admin.action(description="Export selected registrations as CSV")
+    def export_csv(self, request, queryset):
+        return export_participations(request, queryset, "csv")
+
+    @admin.action(description="Export selected registrations as XLSX")
+    def export_xlsx(self, request, queryset):
+        return export_participations(request, queryset, "xlsx")
+
+    def changeform_view(self, request, *args, **kwargs):
+        # The form checks the seats left, but the last one can still be taken
+        # between the check and the save.
+        try:
+            return super().changeform_view(request, *args, **kwargs)
+        except PlanFullError:
+            self.message_user(request, "This plan is full.", messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
+
+    def get_readonly_fields(self, request, obj=None):
+        # Seats are reserved when a participation is created; moving an existing
+        # one to another plan would bypass the capacity check.
+        if obj:
+            return ("participant", "plan")
+        return ()
 
 
 class ParticipationPlanAdmin(admin.ModelAdmin):
@@ -24,15 +118,23 @@ class ParticipationPlanAdmin(admin.ModelAdmin):
         "event",
         "price",
         "mode_of_attendance",
+        "capacity",
+        "reserved_count",
     )
     list_filter = ("event",)
+    list_select_related = ("event", "mode_of_attendance")
     search_fields = ("event__name",)
+    readonly_fields = ("reserved_count",)
 
 
-class ParticipantAdmin(admin.ModelAdmin):
+class ParticipantAdmin(ParticipantSearchMixin, admin.ModelAdmin):
     list_display = ("__str__", "get_email")
+    list_select_related = ("user", "info")
+    ordering = ("id",)
     search_fields = ("user__email", "info__national_code", "info__phone_number")
     readonly_fields = ("user", "info")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def get_email(self, obj):
         return obj.user.email
@@ -40,9 +142,14 @@ class ParticipantAdmin(admin.ModelAdmin):
     get_email.short_description = "Email"
 
 
-class ParticipantInfoAdmin(admin.ModelAdmin):
+class ParticipantInfoAdmin(ParticipantSearchMixin, admin.ModelAdmin):
     list_display = ("first_name", "last_name", "national_code", "phone_number")
+    list_filter = ("image_status",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     search_fields = ("first_name", "last_name", "national_code", "phone_number")
+    participant_path = "participant__"
+    search_may_have_duplicates = True
 
 
 class ModeOfAttendanceAdmin(admin.ModelAdmin):
@@ -51,8 +158,49 @@ class ModeOfAttendanceAdmin(admin.ModelAdmin):
     search_fields = ("name",)
 
 
+class AnnouncementAdmin(PlanChoiceMixin, admin.ModelAdmin):
+    list_display = ("subject", "event", "plan", "has_lunch", "status", "sent_count")
+    list_filter = ("status", "event")
+    list_select_related = ("event", "plan__event", "plan__mode_of_attendance")
+    search_fields = ("subject",)
+    readonly_fields = (
+        "status",
+        "last_participant_id",
+        "sent_count",
+        "created_time",
+        "finished_time",
+    )
+    actions = ("queue",)
+
+    @admin.action(description="Queue for sending (manage.py send_announcements)")
+    def queue(self, request, queryset):
+        count = queryset.filter(status="D").update(status="Q")
+        self.message_user(request, f"{count} announcement(s) queued.")
+
+
+class PlanStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "plan",
+        "event",
+        "participant_count",
+        "lunch_count",
+        "revenue",
+        "updated_time",
+    )
+    list_filter = ("event",)
+    list_select_related = ("event", "plan__event", "plan__mode_of_attendance")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 admin.site.register(ModeOfAttendance, ModeOfAttendanceAdmin)
 admin.site.register(ParticipationPlan, ParticipationPlanAdmin)
 admin.site.register(Participant, ParticipantAdmin)
 admin.site.register(ParticipantInfo, ParticipantInfoAdmin)
 admin.site.register(Participation, ParticipationAdmin)
+admin.site.register(Announcement, AnnouncementAdmin)
+admin.site.register(PlanStats, PlanStatsAdmin)
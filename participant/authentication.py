@@ -0,0 +1,163 @@
+from functools import wraps
+
+from core.async_views import error_response
+from core.cache import is_shared_cache
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# What a cached authenticated user carries: never the password hash, only its
+# digest when tokens are revoked on password changes. Every other field is
+# deferred and loaded from the database if a view reads it.
+AUTH_USER_FIELDS = ("id", "username", "email", "is_active", "is_staff", "is_superuser")
+
+
+def auth_user_cache_key(user_id):
+    return f"participant:auth-user:{user_id}"
+
+
+def auth_cache_enabled():
+    """The cache is only used when it is shared: with a per-process
+    ``LocMemCache`` the other processes would never see an invalidation and a
+    deactivated user or a changed password would still be accepted there."""
+    return settings.JWT_USER_CACHE_TIMEOUT > 0 and is_shared_cache()
+
+
+def invalidate_auth_user(user_id):
+    if not auth_cache_enabled():
+        return
+    key = auth_user_cache_key(user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def dump_auth_user(user):
+    data = {field: getattr(user, field) for field in AUTH_USER_FIELDS}
+    if api_settings.CHECK_REVOKE_TOKEN:
+        data["password_digest"] = get_md5_hash_password(user.password)
+    return data
+
+
+def load_auth_user(data):
+    fields = [f.attname for f in User._meta.concrete_fields if f.attname in data]
+    user = User.from_db("default", fields, [data[field] for field in fields])
+    user.password_digest = data.get("password_digest")
+    return user
+
+
+class ParticipantJWTAuthentication(JWTAuthentication):
+    """JWT authentication that loads the user together with its participant.
+
+    On a cache miss the user, its ``participant`` and the participant's
+    ``info`` are fetched in a single joined query. The user's identity and
+    flags (``AUTH_USER_FIELDS``, not the password hash) are then kept in the
+    shared cache for ``JWT_USER_CACHE_TIMEOUT`` seconds, so authenticating a
+    request does not hit the database; ``get_participant`` loads the
+    participant when a view needs it. Saving a user, participant or info drops
+    the entry (see ``participant.signals``).
+    """
+
+    def _get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+    def _get_user_queryset(self, user_id):
+        return User.objects.select_related("participant__info").filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        )
+
+    def _check_user(self, user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            digest = getattr(user, "password_digest", None) or get_md5_hash_password(
+                user.password
+            )
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != digest:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+    def get_user(self, validated_token):
+        user_id = self._get_user_id(validated_token)
+        key = auth_user_cache_key(user_id)
+        use_cache = auth_cache_enabled()
+        data = cache.get(key) if use_cache else None
+        if data is not None:
+            user = load_auth_user(data)
+        else:
+            user = self._get_user_queryset(user_id).first()
+            if user is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            if use_cache:
+                cache.set(key, dump_auth_user(user), settings.JWT_USER_CACHE_TIMEOUT)
+        self._check_user(user, validated_token)
+        return user
+
+    async def aget_user(self, validated_token):
+        user_id = self._get_user_id(validated_token)
+        key = auth_user_cache_key(user_id)
+        use_cache = auth_cache_enabled()
+        data = await cache.aget(key) if use_cache else None
+        if data is not None:
+            user = load_auth_user(data)
+        else:
+            user = await self._get_user_queryset(user_id).afirst()
+            if user is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            if use_cache:
+                await cache.aset(
+                    key, dump_auth_user(user), settings.JWT_USER_CACHE_TIMEOUT
+                )
+        self._check_user(user, validated_token)
+        return user
+
+    async def aauthenticate(self, request):
+        """Async ``authenticate``: ``(user, token)`` or ``None`` without a
+        bearer token. Token validation is CPU only; the user is loaded through
+        the async cache and ORM APIs."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+
+def async_login_required(read):
+    """Authenticate an async read like the default DRF authentication classes
+    (bearer JWT, then the session) and require a user, answering 401 otherwise.
+    """
+
+    @wraps(read)
+    async def wrapper(request, *args, **kwargs):
+        authentication = ParticipantJWTAuthentication()
+        try:
+            result = await authentication.aauthenticate(request)
+            if result is not None:
+                user = result[0]
+            else:
+                user = await request.auser()
+                if not user.is_authenticated:
+                    raise NotAuthenticated()
+        except APIException as exc:
+            response = error_response(exc)
+            response["WWW-Authenticate"] = authentication.authenticate_header(request)
+            return response
+        request.user = user
+        return await read(request, *args, **kwargs)
+
+    return wrapper
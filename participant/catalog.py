@@ -0,0 +1,81 @@
+"""Per-event plan catalog served as pre-rendered JSON.
+
+The catalog for an event is built with one joined query, rendered once and
+kept in the two-tier cache (``core.cache``) together with its validators, so
+the plan endpoint answers (and revalidates) without touching the database or
+DRF serializers, and a registration surge rebuilds a missing catalog once.
+Signals in ``participant.signals`` rebuild the affected catalogs whenever a
+plan, mode of attendance or event changes.
+"""
+
+import hashlib
+
+from core.cache import CacheNamespace
+from django.conf import settings
+from participant.models import ParticipationPlan
+from participant.serializers import ParticipationPlanSerializer
+from rest_framework.renderers import JSONRenderer
+
+plan_catalogs = CacheNamespace("participant:plan-catalog")
+# Events with their plans, as loaded by the participant dashboard; dropped
+# together with the plan catalogs since they hold the same rows.
+dashboard_events = CacheNamespace("participant:dashboard-events")
+
+
+def _plan_queryset(event_id):
+    return (
+        ParticipationPlan.objects.filter(event=event_id)
+        .select_related("event", "mode_of_attendance")
+        .order_by("id")
+    )
+
+
+def _render_plan_catalog(plans):
+    content = JSONRenderer().render(ParticipationPlanSerializer(plans, many=True).data)
+    changes = [plan.updated_time for plan in plans]
+    changes += [plan.event.updated_time for plan in plans]
+    changes += [
+        plan.mode_of_attendance.updated_time
+        for plan in plans
+        if plan.mode_of_attendance
+    ]
+    return {
+        "content": content,
+        "etag": hashlib.md5(content).hexdigest(),
+        "last_modified": max(changes, default=None),
+    }
+
+
+def _build_plan_catalog(event_id):
+    return _render_plan_catalog(list(_plan_queryset(event_id)))
+
+
+def build_plan_catalog(event_id):
+    dashboard_events.invalidate()
+    return plan_catalogs.refresh(
+        event_id,
+        lambda: _build_plan_catalog(event_id),
+        settings.PLAN_CATALOG_CACHE_TIMEOUT,
+    )
+
+
+def get_plan_catalog(event_id):
+    return plan_catalogs.get_or_set(
+        event_id,
+        lambda: _build_plan_catalog(event_id),
+        settings.PLAN_CATALOG_CACHE_TIMEOUT,
+    )
+
+
+async def aget_plan_catalog(event_id):
+    async def build():
+        return _render_plan_catalog([plan async for plan in _plan_queryset(event_id)])
+
+    return await plan_catalogs.aget_or_set(
+        event_id, build, settings.PLAN_CATALOG_CACHE_TIMEOUT
+    )
+
+
+def drop_plan_catalog(event_id):
+    dashboard_events.invalidate()
+    plan_catalogs.delete(event_id)
@@ -0,0 +1,154 @@
+"""Background processing of participant profile images.
+
+Uploads only store the original, so the request returns as soon as the file is
+written; saving a new image marks the info as pending (see
+``participant.signals``). The ``process_images`` management command then
+decodes each pending original once with Pillow, applies and drops its EXIF
+orientation, and writes fixed-size square thumbnails in WebP and JPEG next to
+it. The storage keys end up in ``ParticipantInfo.image_variants`` as
+``{size: {format: key}}``. The original is replaced with a re-encoded JPEG
+without metadata (location, camera), and the API only exposes ``image`` once
+that is done.
+"""
+
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from participant.models import ParticipantInfo
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+VARIANT_SIZES = {"small": 128, "medium": 512}
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def _decode(file):
+    with file.open("rb") as f:
+        image = Image.open(f)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def build_variants(info):
+    """Write the thumbnails for ``info.image`` and a re-encoded full-size copy;
+    return ``(copy key, variant keys)``. Files written before a failure are
+    deleted again."""
+    image = _decode(info.image)
+    storage = info.image.storage
+    stem = os.path.splitext(info.image.name)[0]
+    written = []
+
+    def save(name, image, fmt, options):
+        buffer = io.BytesIO()
+        # No ``exif=`` argument, so the files carry no metadata.
+        image.save(buffer, fmt, **options)
+        written.append(storage.save(name, ContentFile(buffer.getvalue())))
+        return written[-1]
+
+    try:
+        variants = {}
+        for name, size in VARIANT_SIZES.items():
+            thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            variants[name] = {
+                ext: save(f"{stem}-{name}.{ext}", thumbnail, fmt, options)
+                for ext, (fmt, options) in VARIANT_FORMATS.items()
+            }
+        fmt, options = VARIANT_FORMATS["jpeg"]
+        copy = save(f"{stem}-full.jpeg", image, fmt, options)
+    except Exception:
+        for key in written:
+            storage.delete(key)
+        raise
+    return copy, variants
+
+
+def delete_files(storage, keys):
+    """Delete ``keys`` from ``storage`` once the transaction commits."""
+    keys = [key for key in keys if key]
+    if not keys:
+        return
+
+    def delete():
+        for key in keys:
+            try:
+                storage.delete(key)
+            except Exception:
+                logger.exception("Could not delete %s", key)
+
+    transaction.on_commit(delete)
+
+
+def variant_urls(info, size, request=None):
+    """``{format: url}`` for one thumbnail size, or ``None`` until it is ready.
+
+    Like DRF's file fields, URLs are made absolute when a request is given.
+    """
+    keys = info.image_variants.get(size) if info.image_status == "R" else None
+    if not keys:
+        return None
+    storage = info.image.storage
+    urls = {ext: storage.url(key) for ext, key in keys.items()}
+    if request is not None:
+        urls = {ext: request.build_absolute_uri(url) for ext, url in urls.items()}
+    return urls
+
+
+def process_image(info):
+    """Build the variants of ``info``'s image and swap the original for its
+    re-encoded copy; any error marks the image as failed. Returns whether it
+    succeeded."""
+    original = info.image.name
+    try:
+        copy, variants = build_variants(info)
+    except Exception:
+        logger.exception("Could not process image of %s", info.pk)
+        info.image_variants = {}
+        info.image_status = "F"
+        info.save(update_fields=["image_status", "image_variants", "updated_time"])
+        return False
+    info.image.name = copy
+    info.image_variants = variants
+    info.image_status = "R"
+    # Not a new upload: keep the variants (see participant.signals).
+    info._image_reencoded = True
+    info.save(update_fields=["image", "image_status", "image_variants", "updated_time"])
+    delete_files(info.image.storage, [original])
+    return True
+
+
+def process_pending_images(batch_size=20):
+    """Process up to ``batch_size`` pending images; return ``(done, failed)``.
+
+    Each image is claimed with ``skip_locked``, so several workers can run at
+    once, and processed and saved in its own transaction; an upload replacing
+    it meanwhile waits for that one image and re-queues it.
+    """
+    done = failed = 0
+    for _ in range(batch_size):
+        with transaction.atomic():
+            info = (
+                ParticipantInfo.objects.select_for_update(skip_locked=True)
+                .filter(image_status="P")
+                .order_by("updated_time")
+                .first()
+            )
+            if info is None:
+                break
+            if process_image(info):
+                done += 1
+            else:
+                failed += 1
+    return done, failed
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from participant.images import process_pending_images
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails for newly uploaded participant images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new images instead of exiting once done.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls when nothing is pending.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            done, failed = process_pending_images(batch_size=options["batch_size"])
+            if done or failed:
+                self.stdout.write(f"Processed {done}, failed {failed}")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
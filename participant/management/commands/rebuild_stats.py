@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from participant.models import ParticipationPlan
+from participant.stats import rebuild_plan_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-plan registration statistics from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event", type=int, help="Only rebuild the plans of this event."
+        )
+
+    def handle(self, *args, **options):
+        plans = ParticipationPlan.objects.all()
+        if options["event"]:
+            plans = plans.filter(event=options["event"])
+        rebuilt = rebuild_plan_stats(plans)
+        self.stdout.write(f"Rebuilt statistics for {rebuilt} plan(s)")
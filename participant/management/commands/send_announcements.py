@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from participant.announcements import send_announcement
+from participant.models import Announcement
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued announcements, resuming any that were interrupted. "
+        "Pass ids to send specific announcements regardless of their status."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int)
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=10.0,
+            help="Maximum messages per second; 0 disables rate limiting.",
+        )
+
+    def handle(self, *args, **options):
+        if options["ids"]:
+            announcements = Announcement.objects.filter(id__in=options["ids"])
+            if len(announcements) != len(set(options["ids"])):
+                raise CommandError("Some announcement ids do not exist.")
+        else:
+            announcements = Announcement.objects.filter(status__in=["Q", "S"])
+        for announcement in announcements.order_by("created_time"):
+            sent = send_announcement(
+                announcement,
+                chunk_size=options["chunk_size"],
+                rate=options["rate"],
+            )
+            self.stdout.write(f"{announcement}: sent {sent}")
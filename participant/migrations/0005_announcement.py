@@ -0,0 +1,64 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_outgoingemail"),
+        ("participant", "0004_participantinfo_github_participantinfo_linkedin"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Announcement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255)),
+                ("body", models.TextField()),
+                ("has_lunch", models.BooleanField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("D", "Draft"),
+                            ("Q", "Queued"),
+                            ("S", "Sending"),
+                            ("F", "Finished"),
+                        ],
+                        default="D",
+                        max_length=1,
+                    ),
+                ),
+                ("last_participant_id", models.BigIntegerField(default=0)),
+                ("sent_count", models.PositiveIntegerField(default=0)),
+                ("created_time", models.DateTimeField(auto_now_add=True)),
+                ("finished_time", models.DateTimeField(blank=True, null=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="core.event"
+                    ),
+                ),
+                (
+                    "plan",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="participant.participationplan",
+                    ),
+                ),
+            ],
+        ),
+    ]
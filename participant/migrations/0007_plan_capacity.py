@@ -0,0 +1,57 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:00
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def deduplicate_and_count_participations(apps, schema_editor):
+    """Keep the earliest of duplicate registrations and backfill reserved seats."""
+    Participation = apps.get_model("participant", "Participation")
+    ParticipationPlan = apps.get_model("participant", "ParticipationPlan")
+
+    duplicates = (
+        Participation.objects.values("participant", "plan")
+        .annotate(first_id=Min("id"), count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        Participation.objects.filter(
+            participant=duplicate["participant"], plan=duplicate["plan"]
+        ).exclude(id=duplicate["first_id"]).delete()
+
+    counts = Participation.objects.values("plan").annotate(count=Count("id"))
+    for row in counts:
+        ParticipationPlan.objects.filter(id=row["plan"]).update(
+            reserved_count=row["count"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("participant", "0006_updated_time"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="participationplan",
+            name="capacity",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Leave empty for unlimited seats.", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="participationplan",
+            name="reserved_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            deduplicate_and_count_participations, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="participation",
+            constraint=models.UniqueConstraint(
+                fields=("participant", "plan"), name="unique_participant_plan"
+            ),
+        ),
+    ]
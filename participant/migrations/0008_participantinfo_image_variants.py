@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+def queue_existing_images(apps, schema_editor):
+    ParticipantInfo = apps.get_model("participant", "ParticipantInfo")
+    ParticipantInfo.objects.exclude(image="").exclude(image__isnull=True).update(
+        image_status="P"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("participant", "0007_plan_capacity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="participantinfo",
+            name="image_status",
+            field=models.CharField(
+                blank=True,
+                choices=[("P", "Pending"), ("R", "Ready"), ("F", "Failed")],
+                editable=False,
+                max_length=1,
+            ),
+        ),
+        migrations.AddField(
+            model_name="participantinfo",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(queue_existing_images, migrations.RunPython.noop),
+    ]
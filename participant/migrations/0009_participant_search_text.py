@@ -0,0 +1,74 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:13
+
+import re
+
+from django.db import migrations, models
+
+# A frozen copy of core.text.normalize_search_text as of this migration, so
+# later changes to it do not change what this migration does.
+PERSIAN_TRANSLATION = str.maketrans(
+    {
+        "\u064a": "\u06cc",
+        "\u0649": "\u06cc",
+        "\u0643": "\u06a9",
+        "\u0629": "\u0647",
+        "\u0623": "\u0627",
+        "\u0625": "\u0627",
+        "\u200c": " ",
+        "\u200f": None,
+        "\u0640": None,
+        **{chr(0x06F0 + i): str(i) for i in range(10)},
+        **{chr(0x0660 + i): str(i) for i in range(10)},
+    }
+)
+DIACRITICS = re.compile("[\u064b-\u0652\u0670]")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_search_text(text):
+    text = DIACRITICS.sub("", (text or "").translate(PERSIAN_TRANSLATION))
+    return WHITESPACE.sub(" ", text).strip().lower()
+
+
+INFO_FIELDS = (
+    "first_name",
+    "last_name",
+    "first_name_persian",
+    "last_name_persian",
+    "national_code",
+    "phone_number",
+)
+
+
+def fill_search_text(apps, schema_editor):
+    Participant = apps.get_model("participant", "Participant")
+    batch = []
+    participants = Participant.objects.select_related("user", "info").iterator(
+        chunk_size=2000
+    )
+    for participant in participants:
+        parts = [participant.user.email]
+        if participant.info:
+            parts += [getattr(participant.info, field) for field in INFO_FIELDS]
+        participant.search_text = normalize_search_text(" ".join(filter(None, parts)))
+        batch.append(participant)
+        if len(batch) == 2000:
+            Participant.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    Participant.objects.bulk_update(batch, ["search_text"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("participant", "0008_participantinfo_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="participant",
+            name="search_text",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_plan_stats(apps, schema_editor):
+    ParticipationPlan = apps.get_model("participant", "ParticipationPlan")
+    PlanStats = apps.get_model("participant", "PlanStats")
+    plans = ParticipationPlan.objects.select_related("mode_of_attendance").annotate(
+        registrations=Count("participation")
+    )
+    PlanStats.objects.bulk_create(
+        PlanStats(
+            event_id=plan.event_id,
+            plan=plan,
+            participant_count=plan.registrations,
+            lunch_count=(
+                plan.registrations
+                if plan.mode_of_attendance and plan.mode_of_attendance.has_lunch
+                else 0
+            ),
+            revenue=plan.registrations * plan.price,
+        )
+        for plan in plans
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_event_waiting_room"),
+        ("participant", "0009_participant_search_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlanStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("participant_count", models.PositiveIntegerField(default=0)),
+                ("lunch_count", models.PositiveIntegerField(default=0)),
+                ("revenue", models.BigIntegerField(default=0)),
+                ("updated_time", models.DateTimeField(auto_now=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="core.event",
+                    ),
+                ),
+                (
+                    "plan",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="participant.participationplan",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(fill_plan_stats, migrations.RunPython.noop),
+    ]
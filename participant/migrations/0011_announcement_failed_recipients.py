@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("participant", "0010_planstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="announcement",
+            name="failed_recipients",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
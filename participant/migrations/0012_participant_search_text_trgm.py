@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:50
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # A trigram index serves LIKE '%term%'. SQLite has no equivalent, so
+    # development databases scan the column instead. Built CONCURRENTLY (hence
+    # the non-atomic migration) so participants stay writable meanwhile; the
+    # SQL is what django.contrib.postgres's AddIndexConcurrently would run,
+    # which cannot be imported without psycopg.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS participant_search_text_trgm "
+        "ON participant_participant USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "DROP INDEX CONCURRENTLY IF EXISTS participant_search_text_trgm"
+    )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("participant", "0011_announcement_failed_recipients"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("participant", "0012_participant_search_text_trgm"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="announcement",
+            name="failed_recipients",
+        ),
+    ]
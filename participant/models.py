@@ -2,10 +2,15 @@ import uuid
 
 from core.models import Event
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
 from django.utils.deconstruct import deconstructible
 
 
+class PlanFullError(Exception):
+    pass
+
+
 @deconstructible
 class UniqueUploadPath:
     def __init__(self, sub_path):
@@ -18,6 +23,7 @@ class UniqueUploadPath:
 
 class ParticipantInfo(models.Model):
     GENDER_CHOICES = (("M", "Male"), ("F", "Female"), ("O", "Other"))
+    IMAGE_STATUS_CHOICES = (("P", "Pending"), ("R", "Ready"), ("F", "Failed"))
 
     first_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, blank=True)
@@ -31,11 +37,17 @@ class ParticipantInfo(models.Model):
     gender = models.CharField(max_length=1, default="M", choices=GENDER_CHOICES)
     resume = models.FileField(upload_to="resumes/", blank=True, null=True)
     image = models.ImageField(upload_to="participants/", blank=True, null=True)
+    # Filled in by ``manage.py process_images`` (see participant.images).
+    image_status = models.CharField(
+        max_length=1, blank=True, choices=IMAGE_STATUS_CHOICES, editable=False
+    )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     github = models.URLField(max_length=200, blank=True, null=True)
     linkedin = models.URLField(max_length=200, blank=True, null=True)
 
     student_id = models.CharField(max_length=15, blank=True)
     taken_courses = models.CharField(max_length=100, blank=True)
+    updated_time = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.national_code}"
@@ -47,6 +59,8 @@ class Participant(models.Model):
         ParticipantInfo, on_delete=models.SET_NULL, null=True, blank=True
     )
     password_reset_code = models.CharField(max_length=10, blank=True, null=True)
+    # Normalized email, names and codes (see participant.search).
+    search_text = models.TextField(blank=True, default="", editable=False)
 
     def __str__(self):
         if self.info:
@@ -59,6 +73,7 @@ class ModeOfAttendance(models.Model):
     name = models.CharField(max_length=50)
     is_national_code_required = models.BooleanField(default=False)
     has_lunch = models.BooleanField(default=False)
+    updated_time = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.name} {'with lunch' if self.has_lunch else 'without lunch'}"
@@ -70,10 +85,35 @@ class ParticipationPlan(models.Model):
     mode_of_attendance = models.ForeignKey(
         ModeOfAttendance, on_delete=models.CASCADE, null=True, blank=True
     )
+    capacity = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Leave empty for unlimited seats."
+    )
+    reserved_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_time = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.event} - {self.mode_of_attendance}"
 
+    def save(self, *args, update_fields=None, **kwargs):
+        """Never write ``reserved_count`` back when updating a plan.
+
+        It only changes through the conditional UPDATEs of
+        ``Participation.save`` and ``release_plan_seat``; the value loaded
+        with this instance may already be stale, e.g. when an admin edits the
+        price while registrations are open.
+        """
+        if not self._state.adding:
+            if update_fields is None:
+                update_fields = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key
+                ]
+            update_fields = [
+                field for field in update_fields if field != "reserved_count"
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
+
 
 class Participation(models.Model):
     participant = models.ForeignKey(Participant, on_delete=models.CASCADE)
@@ -82,3 +122,78 @@ class Participation(models.Model):
 
     def __str__(self):
         return f"{self.participant} - {self.plan}"
+
+    def save(self, *args, **kwargs):
+        """Reserve a seat on the plan in the same transaction as the insert.
+
+        The conditional UPDATE cannot oversell: concurrent registrations
+        serialize on the plan row and re-check the remaining capacity, and a
+        failed insert (e.g. a duplicate registration) rolls the seat back.
+        Seats are released by a post_delete signal.
+        """
+        with transaction.atomic():
+            if self._state.adding:
+                reserved = (
+                    ParticipationPlan.objects.filter(pk=self.plan_id)
+                    .filter(
+                        Q(capacity__isnull=True) | Q(reserved_count__lt=F("capacity"))
+                    )
+                    .update(reserved_count=F("reserved_count") + 1)
+                )
+                if not reserved:
+                    raise PlanFullError(f"Plan {self.plan_id} has no seats left.")
+            super().save(*args, **kwargs)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["participant", "plan"], name="unique_participant_plan"
+            )
+        ]
+
+
+class PlanStats(models.Model):
+    """Registration totals per plan, kept in step with Participation inserts
+    and deletes (see participant.stats); ``manage.py rebuild_stats`` recomputes
+    them from scratch."""
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="stats")
+    plan = models.OneToOneField(
+        ParticipationPlan, on_delete=models.CASCADE, related_name="stats"
+    )
+    participant_count = models.PositiveIntegerField(default=0)
+    lunch_count = models.PositiveIntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.plan}: {self.participant_count}"
+
+
+class Announcement(models.Model):
+    """An email to everyone registered for an event, optionally narrowed down to
+    one plan or to attendees with/without lunch. ``last_participant_id`` records
+    how far sending got so an interrupted run resumes where it stopped."""
+
+    STATUS_CHOICES = (
+        ("D", "Draft"),
+        ("Q", "Queued"),
+        ("S", "Sending"),
+        ("F", "Finished"),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    event = models.ForeignKey(Event, on_delete=models.CASCADE)
+    plan = models.ForeignKey(
+        ParticipationPlan, on_delete=models.CASCADE, null=True, blank=True
+    )
+    has_lunch = models.BooleanField(null=True, blank=True)
+    status = models.CharField(max_length=1, default="D", choices=STATUS_CHOICES)
+    last_participant_id = models.BigIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    created_time = models.DateTimeField(auto_now_add=True)
+    finished_time = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.event} - {self.subject}"
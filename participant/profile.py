@@ -0,0 +1,61 @@
+"""Cached serialized participant profile.
+
+The profile endpoint keeps the serialized ``ParticipantInfo`` per participant
+for ``PROFILE_CACHE_TIMEOUT`` seconds. The timeout must stay below the
+remaining lifetime of signed media URLs handed out by ``core.storage``, since
+the cached payload embeds the resume and image URLs. Signals in
+``participant.signals`` drop the entry whenever the info or the user's email
+changes. Profiles are only cached in a shared cache: with a per-process one
+the other processes would keep serving a profile after it was updated.
+"""
+
+from core.cache import is_shared_cache
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def profile_cache_key(participant_id):
+    return f"participant:profile:{participant_id}"
+
+
+def profile_cache_enabled():
+    return settings.PROFILE_CACHE_TIMEOUT > 0 and is_shared_cache()
+
+
+def get_cached_profile(participant_id):
+    if not profile_cache_enabled():
+        return None
+    return cache.get(profile_cache_key(participant_id))
+
+
+async def aget_cached_profile(participant_id):
+    if not profile_cache_enabled():
+        return None
+    return await cache.aget(profile_cache_key(participant_id))
+
+
+def set_cached_profile(participant_id, data):
+    if profile_cache_enabled():
+        cache.set(
+            profile_cache_key(participant_id),
+            dict(data),
+            settings.PROFILE_CACHE_TIMEOUT,
+        )
+
+
+async def aset_cached_profile(participant_id, data):
+    if profile_cache_enabled():
+        await cache.aset(
+            profile_cache_key(participant_id),
+            dict(data),
+            settings.PROFILE_CACHE_TIMEOUT,
+        )
+
+
+def invalidate_profiles(participant_ids):
+    if not profile_cache_enabled():
+        return
+    keys = [profile_cache_key(participant_id) for participant_id in participant_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
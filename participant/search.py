@@ -0,0 +1,48 @@
+"""Participant search over a single normalized column.
+
+``Participant.search_text`` holds the email, the English and Persian names,
+the national code and the phone number, run through
+``core.text.normalize_search_text``. It is refreshed whenever the participant,
+its user or its info is saved (see ``participant.signals``). Searching is a
+``LIKE '%term%'`` per query word on that one column, with no joins. On
+PostgreSQL a pg_trgm GIN index serves these lookups. SQLite, used only in
+development, falls back to scanning the column.
+"""
+
+from core.text import normalize_search_text
+from participant.models import Participant
+
+
+def build_search_text(user, info):
+    parts = [user.email if user else ""]
+    if info:
+        parts += [
+            info.first_name,
+            info.last_name,
+            info.first_name_persian,
+            info.last_name_persian,
+            info.national_code,
+            info.phone_number,
+        ]
+    return normalize_search_text(" ".join(filter(None, parts)))
+
+
+def refresh_search_text(participants):
+    """Recompute the column for ``participants`` (with user and info loaded)."""
+    for participant in participants:
+        search_text = build_search_text(participant.user, participant.info)
+        if search_text != participant.search_text:
+            Participant.objects.filter(pk=participant.pk).update(
+                search_text=search_text
+            )
+
+
+def search_participants(queryset, term, prefix=""):
+    """Filter ``queryset`` to rows matching every word of ``term``.
+
+    ``prefix`` is the path to the participant, e.g. ``"participant__"`` when
+    searching participant infos.
+    """
+    for word in normalize_search_text(term).split():
+        queryset = queryset.filter(**{f"{prefix}search_text__contains": word})
+    return queryset
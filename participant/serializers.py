@@ -1,17 +1,48 @@
+import copy
 import re
 
-from django.contrib.auth.hashers import make_password
+from core import hashing
+from core.models import filter_by_email, normalize_email
+from core.serializers import EventSerializer
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.utils.crypto import get_random_string
+from participant.export import COLUMNS, DEFAULT_COLUMNS
+from participant.images import VARIANT_SIZES, variant_urls
 from participant.models import (
     ModeOfAttendance,
     Participant,
     ParticipantInfo,
     Participation,
     ParticipationPlan,
+    PlanFullError,
 )
+from participant.uploads import UPLOAD_FIELDS
 from rest_framework import serializers
 
 
+class UploadRequestSerializer(serializers.Serializer):
+    field = serializers.ChoiceField(choices=list(UPLOAD_FIELDS))
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+
+    def validate(self, attrs):
+        field = attrs["field"]
+        if attrs["content_type"] not in UPLOAD_FIELDS[field]["types"]:
+            raise serializers.ValidationError(
+                {"content_type": "This file type is not allowed."}
+            )
+        if attrs["size"] > settings.UPLOAD_MAX_SIZES[field]:
+            raise serializers.ValidationError({"size": "File is too large."})
+        return attrs
+
+
+class UploadConfirmSerializer(serializers.Serializer):
+    token = serializers.CharField()
+
+
 class PasswordChangeSerializer(serializers.Serializer):
     old_password = serializers.CharField(write_only=True, required=True)
     new_password = serializers.CharField(write_only=True, required=True)
@@ -31,10 +62,16 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("id", "email", "password")
-        extra_kwargs = {"password": {"write_only": True}}
+        extra_kwargs = {
+            "email": {"required": True, "allow_blank": False},
+            "password": {"write_only": True},
+        }
 
-    def validate_password(self, value: str) -> str:
-        return make_password(value)
+    def validate_email(self, value: str) -> str:
+        return normalize_email(value)
+
+
+USERNAME_ATTEMPTS = 3
 
 
 class ParticipantSerializer(serializers.ModelSerializer):
@@ -45,33 +82,111 @@ class ParticipantSerializer(serializers.ModelSerializer):
         fields = ("user",)
 
     def create(self, validated_data):
+        # The password is hashed exactly once, and duplicate emails are rejected
+        # by the unique index on auth_user.email rather than by a racy pre-check.
         user_data = validated_data.pop("user")
-        if User.objects.filter(email=user_data["email"]).exists():
-            raise serializers.ValidationError("User with this email already exists.")
-        user_data["username"] = user_data["email"].replace("@", "_").replace(".", "_")
-        password = user_data.pop("password", None)
-        user = User.objects.create(**user_data)
-        if password:
-            user.set_password(password)
-            user.save()
-        participant = Participant.objects.create(user=user, **validated_data)
-        participant.info = ParticipantInfo.objects.create()
-        participant.save()
-        return participant
+        user_data["password"] = hashing.make_password(user_data["password"])
+        username = user_data["email"].replace("@", "_").replace(".", "_")
+        for _ in range(USERNAME_ATTEMPTS):
+            user_data["username"] = username
+            try:
+                with transaction.atomic():
+                    info = ParticipantInfo.objects.create()
+                    user = User.objects.create(**user_data)
+                    participant = Participant.objects.create(
+                        user=user, info=info, **validated_data
+                    )
+            except IntegrityError:
+                if filter_by_email(User.objects, user_data["email"]).exists():
+                    raise serializers.ValidationError(
+                        "User with this email already exists."
+                    )
+                # Different emails can map to the same username (a.b@x and
+                # a_b@x); retry with a random suffix.
+                suffix = "_" + get_random_string(6)
+                username = username[: 150 - len(suffix)] + suffix
+            else:
+                return participant
+        raise serializers.ValidationError("Could not create the account, try again.")
 
 
 class ParticipantInfoSerializer(serializers.ModelSerializer):
+    """Participant info with its owner's email.
+
+    Views that already hold the user pass its email as ``context["email"]``;
+    otherwise it is looked up with one query per object.
+
+    Partial updates only validate and write the fields whose submitted value
+    differs from the stored one; file fields count as changed only when a new
+    file is uploaded or the stored one is cleared.
+
+    ``image`` is only shown once processing has replaced the upload with a copy
+    stripped of its metadata (see ``participant.images``).
+    """
+
     email = serializers.SerializerMethodField(read_only=True)
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = ParticipantInfo
         fields = "__all__"
 
+    def to_internal_value(self, data):
+        if self.partial and self.instance is not None:
+            # Copy rather than rebuild: a QueryDict must stay one, since the
+            # fields parse multipart values (e.g. ``image=""``) differently. A
+            # shallow copy, as ``QueryDict.copy()`` deep-copies uploaded files.
+            unchanged = [
+                name for name in data if not self._has_changed(name, data[name])
+            ]
+            data = copy.copy(data)
+            for name in unchanged:
+                del data[name]
+        return super().to_internal_value(data)
+
+    def _has_changed(self, name, value):
+        field = self.fields.get(name)
+        if field is None or field.read_only:
+            return False
+        current = getattr(self.instance, field.source)
+        if isinstance(field, serializers.FileField):
+            if value in (None, ""):
+                return bool(current)
+            return hasattr(value, "read")
+        if current is None or value is None:
+            return current != value
+        return field.to_representation(current) != value
+
+    def update(self, instance, validated_data):
+        if not self.partial:
+            return super().update(instance, validated_data)
+        if validated_data:
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            update_fields = {*validated_data, "updated_time"}
+            if "image" in validated_data:
+                update_fields |= {"image_status", "image_variants"}
+            instance.save(update_fields=update_fields)
+        return instance
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.image_status != "R":
+            data["image"] = None
+        return data
+
+    def get_image_variants(self, obj) -> dict:
+        request = self.context.get("request")
+        return {size: variant_urls(obj, size, request) for size in VARIANT_SIZES}
+
     def get_email(self, obj) -> str:
-        participant = Participant.objects.filter(info=obj).first()
-        if participant and participant.user:
-            return participant.user.email
-        return None
+        if "email" in self.context:
+            return self.context["email"]
+        return (
+            Participant.objects.filter(info=obj)
+            .values_list("user__email", flat=True)
+            .first()
+        )
 
     def validate_national_code(self, value: str) -> str:
         if value == "":
@@ -115,6 +230,29 @@ class ParticipationSerializer(serializers.ModelSerializer):
         fields = ("plan",)
 
 
+class ParticipationCreateSerializer(serializers.Serializer):
+    plan = serializers.IntegerField(write_only=True)
+
+    def validate_plan(self, value: int) -> int:
+        if not ParticipationPlan.objects.filter(
+            pk=value, event=self.context["event_id"]
+        ).exists():
+            raise serializers.ValidationError("Plan not found for this event.")
+        return value
+
+    def create(self, validated_data):
+        participation = Participation(
+            participant=self.context["participant"], plan_id=validated_data["plan"]
+        )
+        try:
+            participation.save()
+        except PlanFullError:
+            raise serializers.ValidationError("This plan is full.")
+        except IntegrityError:
+            raise serializers.ValidationError("Already registered for this plan.")
+        return participation
+
+
 class ParticipationPlanSerializer(serializers.ModelSerializer):
     event = serializers.CharField(source="event.name", read_only=True)
     mode_of_attendance = ModeOfAttendanceSerializer()
@@ -122,3 +260,82 @@ class ParticipationPlanSerializer(serializers.ModelSerializer):
     class Meta:
         model = ParticipationPlan
         fields = ("id", "price", "event", "mode_of_attendance")
+
+
+class DashboardEventSerializer(EventSerializer):
+    """An event with its plans and the participant's registrations in it.
+
+    Expects ``plans`` prefetched with their mode of attendance, and the
+    participant's participations grouped by event id in
+    ``context["participations"]``.
+    """
+
+    plans = ParticipationPlanSerializer(
+        source="participationplan_set", many=True, read_only=True
+    )
+    participations = serializers.SerializerMethodField()
+
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ("plans", "participations")
+
+    def get_participations(self, obj) -> list:
+        participations = self.context["participations"].get(obj.id, [])
+        return ParticipationSerializer(participations, many=True).data
+
+
+class ParticipantSearchSerializer(serializers.ModelSerializer):
+    email = serializers.EmailField(source="user.email", read_only=True)
+    first_name = serializers.CharField(source="info.first_name", read_only=True)
+    last_name = serializers.CharField(source="info.last_name", read_only=True)
+    first_name_persian = serializers.CharField(
+        source="info.first_name_persian", read_only=True
+    )
+    last_name_persian = serializers.CharField(
+        source="info.last_name_persian", read_only=True
+    )
+    national_code = serializers.CharField(source="info.national_code", read_only=True)
+    phone_number = serializers.CharField(source="info.phone_number", read_only=True)
+
+    class Meta:
+        model = Participant
+        fields = (
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "first_name_persian",
+            "last_name_persian",
+            "national_code",
+            "phone_number",
+        )
+
+
+class ParticipationExportSerializer(serializers.Serializer):
+    columns = serializers.CharField(
+        required=False, help_text="Comma-separated column names"
+    )
+    event = serializers.IntegerField(required=False)
+    plan = serializers.IntegerField(required=False)
+    has_lunch = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate_columns(self, value: str) -> list:
+        columns = [column.strip() for column in value.split(",") if column.strip()]
+        unknown = [column for column in columns if column not in COLUMNS]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown columns: {', '.join(unknown)}. "
+                f"Available: {', '.join(COLUMNS)}."
+            )
+        return columns or list(DEFAULT_COLUMNS)
+
+    def filter(self, queryset):
+        data = self.validated_data
+        if "event" in data:
+            queryset = queryset.filter(plan__event=data["event"])
+        if "plan" in data:
+            queryset = queryset.filter(plan=data["plan"])
+        if data["has_lunch"] is not None:
+            queryset = queryset.filter(
+                plan__mode_of_attendance__has_lunch=data["has_lunch"]
+            )
+        return queryset
@@ -0,0 +1,194 @@
+from core.models import Event
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from participant.authentication import invalidate_auth_user
+from participant.catalog import build_plan_catalog, drop_plan_catalog
+from participant.images import delete_files
+from participant.models import (
+    ModeOfAttendance,
+    Participant,
+    ParticipantInfo,
+    Participation,
+    ParticipationPlan,
+)
+from participant.profile import invalidate_profiles
+from participant.search import build_search_text, refresh_search_text
+from participant.stats import rebuild_plan_stats, record_participation
+from participant.waiting_room import waiting_room_configs
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    invalidate_auth_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_profile(sender, instance, update_fields=None, **kwargs):
+    # Sign-ins save last_login only; the cached profile just embeds the email.
+    if update_fields is not None and "email" not in update_fields:
+        return
+    invalidate_profiles(
+        Participant.objects.filter(user=instance).values_list("id", flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=Participant)
+def invalidate_participant(sender, instance, **kwargs):
+    invalidate_auth_user(instance.user_id)
+    invalidate_profiles([instance.pk])
+
+
+# Deleting an info nulls Participant.info with a bulk UPDATE, so the owners must
+# be looked up before the delete happens.
+@receiver([post_save, pre_delete], sender=ParticipantInfo)
+def invalidate_participant_info(sender, instance, **kwargs):
+    owners = list(
+        Participant.objects.filter(info=instance).values_list("id", "user_id")
+    )
+    for _, user_id in owners:
+        invalidate_auth_user(user_id)
+    invalidate_profiles(participant_id for participant_id, _ in owners)
+
+
+def rebuild_plan_catalogs(event_ids):
+    event_ids = set(event_ids)
+
+    def rebuild():
+        for event_id in event_ids:
+            build_plan_catalog(event_id)
+
+    transaction.on_commit(rebuild)
+
+
+@receiver(pre_save, sender=ParticipantInfo)
+def queue_image_processing(sender, instance, update_fields=None, **kwargs):
+    # Partial saves that include the image must also list image_status and
+    # image_variants (see ParticipantInfoSerializer.update).
+    if update_fields is not None and "image" not in update_fields:
+        return
+    if getattr(instance, "_image_reencoded", False):
+        return
+    previous_image, previous_variants = (
+        ParticipantInfo.objects.filter(pk=instance.pk)
+        .values_list("image", "image_variants")
+        .first()
+        if instance.pk
+        else None
+    ) or (None, {})
+    current = instance.image.name or ""
+    if current == (previous_image or ""):
+        return
+    delete_files(
+        instance.image.storage,
+        [key for formats in previous_variants.values() for key in formats.values()],
+    )
+    instance.image_variants = {}
+    instance.image_status = "P" if current else ""
+
+
+@receiver(pre_save, sender=ParticipationPlan)
+def remember_plan_event(sender, instance, **kwargs):
+    # A plan moved to another event must also leave the old event's catalog.
+    instance._previous_event_id = (
+        ParticipationPlan.objects.filter(pk=instance.pk)
+        .values_list("event_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver([post_save, post_delete], sender=ParticipationPlan)
+def update_plan_catalog_for_plan(sender, instance, **kwargs):
+    previous_event_id = getattr(instance, "_previous_event_id", None)
+    rebuild_plan_catalogs({instance.event_id, previous_event_id} - {None})
+
+
+@receiver(post_save, sender=ModeOfAttendance)
+def update_plan_catalog_for_mode_of_attendance(sender, instance, **kwargs):
+    rebuild_plan_catalogs(
+        ParticipationPlan.objects.filter(mode_of_attendance=instance)
+        .values_list("event_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_save, sender=ParticipationPlan)
+def update_stats_for_plan(sender, instance, **kwargs):
+    # Price, event or mode of attendance may have changed.
+    rebuild_plan_stats(ParticipationPlan.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=ModeOfAttendance)
+def update_stats_for_mode_of_attendance(sender, instance, **kwargs):
+    rebuild_plan_stats(ParticipationPlan.objects.filter(mode_of_attendance=instance))
+
+
+@receiver(post_save, sender=Participation)
+def count_participation(sender, instance, created, **kwargs):
+    if created:
+        record_participation(instance.plan_id, 1)
+
+
+@receiver(post_delete, sender=Participation)
+def uncount_participation(sender, instance, **kwargs):
+    record_participation(instance.plan_id, -1)
+
+
+@receiver(post_save, sender=Event)
+def update_plan_catalog_for_event(sender, instance, **kwargs):
+    rebuild_plan_catalogs([instance.pk])
+
+
+@receiver(post_delete, sender=Event)
+def drop_plan_catalog_for_event(sender, instance, **kwargs):
+    event_id = instance.pk
+    transaction.on_commit(lambda: drop_plan_catalog(event_id))
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_waiting_room_config(sender, instance, **kwargs):
+    event_id = instance.pk
+    transaction.on_commit(lambda: waiting_room_configs.delete(event_id))
+
+
+@receiver(post_delete, sender=Participation)
+def release_plan_seat(sender, instance, **kwargs):
+    ParticipationPlan.objects.filter(pk=instance.plan_id, reserved_count__gt=0).update(
+        reserved_count=F("reserved_count") - 1
+    )
+
+
+@receiver(pre_save, sender=Participant)
+def update_search_text(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None:
+        instance.search_text = build_search_text(instance.user, instance.info)
+
+
+@receiver(post_save, sender=Participant)
+def update_search_text_after_partial_save(
+    sender, instance, update_fields=None, **kwargs
+):
+    # A partial save cannot add search_text to its update_fields from pre_save.
+    if update_fields is not None and {"user", "info"} & set(update_fields):
+        refresh_search_text([instance])
+
+
+@receiver(post_save, sender=ParticipantInfo)
+def update_search_text_for_info(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_text(
+            Participant.objects.filter(info=instance).select_related("user", "info")
+        )
+
+
+@receiver(post_save, sender=User)
+def update_search_text_for_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "email" not in update_fields:
+        return
+    refresh_search_text(
+        Participant.objects.filter(user=instance).select_related("user", "info")
+    )
@@ -0,0 +1,85 @@
+"""Per-plan registration statistics.
+
+``PlanStats`` holds, for every plan, the number of registrations, how many of
+them come with lunch and the revenue (registrations times the plan price).
+Signals in ``participant.signals`` apply each Participation insert or delete
+as a single conditional UPDATE inside the same transaction, and recompute a
+plan's row when its price, event or mode of attendance changes. Recomputing
+locks the plan row, the same lock registration takes to reserve a seat, so a
+rebuild never races with concurrent registrations.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F
+from participant.models import Participation, ParticipationPlan, PlanStats
+
+
+def _has_lunch(plan):
+    return bool(plan.mode_of_attendance and plan.mode_of_attendance.has_lunch)
+
+
+def record_participation(plan_id, delta):
+    """Add ``delta`` (1 or -1) registrations on the plan to its stats row."""
+    plan = (
+        ParticipationPlan.objects.select_related("mode_of_attendance")
+        .filter(pk=plan_id)
+        .first()
+    )
+    if plan is None:
+        return
+    updated = PlanStats.objects.filter(plan=plan).update(
+        participant_count=F("participant_count") + delta,
+        lunch_count=F("lunch_count") + (delta if _has_lunch(plan) else 0),
+        revenue=F("revenue") + delta * plan.price,
+    )
+    # Plans get their row when created; only a registration may need to
+    # create a missing one (a delete may be part of deleting the plan itself).
+    if not updated and delta > 0:
+        rebuild_plan_stats(ParticipationPlan.objects.filter(pk=plan_id))
+
+
+def rebuild_plan_stats(plans=None):
+    """Recompute the stats rows of ``plans`` (all plans by default)."""
+    if plans is None:
+        plans = ParticipationPlan.objects.all()
+    with transaction.atomic():
+        plan_ids = list(
+            plans.select_for_update().order_by("pk").values_list("pk", flat=True)
+        )
+        counts = dict(
+            Participation.objects.filter(plan__in=plan_ids)
+            .values("plan")
+            .annotate(count=Count("id"))
+            .values_list("plan", "count")
+        )
+        plans = ParticipationPlan.objects.filter(pk__in=plan_ids).select_related(
+            "mode_of_attendance"
+        )
+        for plan in plans:
+            count = counts.get(plan.pk, 0)
+            PlanStats.objects.update_or_create(
+                plan=plan,
+                defaults={
+                    "event_id": plan.event_id,
+                    "participant_count": count,
+                    "lunch_count": count if _has_lunch(plan) else 0,
+                    "revenue": count * plan.price,
+                },
+            )
+    return len(plan_ids)
+
+
+def event_stats(event_id):
+    """Per-plan rows and totals for an event, read from ``PlanStats`` alone."""
+    plans = list(
+        PlanStats.objects.filter(event_id=event_id)
+        .order_by("plan_id")
+        .values(
+            "plan_id", "participant_count", "lunch_count", "revenue", "updated_time"
+        )
+    )
+    totals = {
+        field: sum(plan[field] for plan in plans)
+        for field in ("participant_count", "lunch_count", "revenue")
+    }
+    return {"event": event_id, "plans": plans, "totals": totals}
@@ -0,0 +1,445 @@
+import io
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from smtplib import SMTPServerDisconnected
+from unittest import mock
+
+from core import throttling
+from core.mail import send_outbox_batch
+from core.models import Event, OutgoingEmail
+from core.testing import ADMIN_STORAGES, ROWS, ChangelistQueryTestCase
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail import EmailMessage
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from django.utils import timezone
+from participant import profile, waiting_room
+from participant.announcements import send_announcement
+from participant.models import (
+    Announcement,
+    ModeOfAttendance,
+    Participant,
+    ParticipantInfo,
+    Participation,
+    ParticipationPlan,
+    PlanFullError,
+)
+from PIL import Image
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def create_plan(**kwargs):
+    event = Event.objects.create(
+        name="AIA", starting_date=timezone.now() + timedelta(days=7)
+    )
+    mode = ModeOfAttendance.objects.create(name="In person", has_lunch=True)
+    return ParticipationPlan.objects.create(
+        event=event, mode_of_attendance=mode, price=100, **kwargs
+    )
+
+
+def create_participant(email, **kwargs):
+    user = User.objects.create_user(email, email, "password", **kwargs)
+    return Participant.objects.create(user=user)
+
+
+class ParticipationCapacityTests(TransactionTestCase):
+    def test_concurrent_registrations_never_exceed_capacity(self):
+        plan = create_plan(capacity=3)
+        participants = [create_participant(f"p{i}@example.com") for i in range(12)]
+        barrier = threading.Barrier(len(participants))
+        outcomes = []
+
+        def register(participant):
+            barrier.wait()
+            try:
+                while True:
+                    try:
+                        Participation(participant=participant, plan=plan).save()
+                        outcomes.append("registered")
+                        return
+                    except PlanFullError:
+                        outcomes.append("full")
+                        return
+                    except OperationalError:
+                        # SQLite rejects concurrent writers instead of queueing.
+                        continue
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=register, args=(participant,))
+            for participant in participants
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        plan.refresh_from_db()
+        self.assertEqual(outcomes.count("registered"), 3)
+        self.assertEqual(outcomes.count("full"), 9)
+        self.assertEqual(Participation.objects.filter(plan=plan).count(), 3)
+        self.assertEqual(plan.reserved_count, 3)
+
+    def test_saving_stale_plan_keeps_reserved_count(self):
+        plan = create_plan(capacity=3)
+        stale = ParticipationPlan.objects.get(pk=plan.pk)
+        Participation(participant=create_participant("p@example.com"), plan=plan).save()
+
+        stale.price = 100
+        stale.save()
+
+        plan.refresh_from_db()
+        self.assertEqual(plan.price, 100)
+        self.assertEqual(plan.reserved_count, 1)
+
+
+@override_settings(STORAGES=ADMIN_STORAGES)
+class ParticipationAdminTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(self.admin)
+
+    def test_adding_to_full_plan_shows_error(self):
+        plan = create_plan(capacity=1)
+        Participation.objects.create(
+            participant=create_participant("first@example.com"), plan=plan
+        )
+        participant = create_participant("second@example.com")
+
+        response = self.client.post(
+            reverse("admin:participant_participation_add"),
+            {"participant": participant.pk, "plan": plan.pk},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(
+            response.context["adminform"].form, "plan", "This plan is full."
+        )
+        self.assertFalse(Participation.objects.filter(participant=participant).exists())
+
+
+class WaitingRoomTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Freeze the clock so the slots do not move on between tickets.
+        patcher = mock.patch("time.time", return_value=time.time())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def slot(self, ticket, event_id=1):
+        return waiting_room.read_ticket(ticket, event_id)["a"]
+
+    def test_slots_fill_up_at_admission_rate(self):
+        slots = [
+            self.slot(waiting_room.issue_ticket(1, user_id, 2)) for user_id in range(5)
+        ]
+        self.assertEqual(slots[0], slots[1])
+        self.assertEqual(slots[2], slots[3])
+        self.assertEqual(slots[2], slots[0] + 1)
+        self.assertEqual(slots[4], slots[0] + 2)
+
+    def test_head_only_moves_forward(self):
+        store = waiting_room.get_store()
+        head_key = "waiting-room:1:head"
+        for user_id in range(5):
+            waiting_room.issue_ticket(1, user_id, 2)
+        head = store.get_many([head_key])[head_key]
+        self.assertEqual(head, int(time.time()) + 2)
+
+        # A caller that read the head before it was first set.
+        with mock.patch.object(store, "get_many", return_value={}):
+            slot = waiting_room.reserve_slot(store, 1, 2)
+        self.assertEqual(slot, head)
+        self.assertEqual(store.get_many([head_key])[head_key], head)
+
+    def test_user_keeps_one_slot(self):
+        first = self.slot(waiting_room.issue_ticket(1, 7, 1))
+        again = [self.slot(waiting_room.issue_ticket(1, 7, 1)) for _ in range(3)]
+        self.assertEqual(again, [first] * 3)
+        self.assertEqual(self.slot(waiting_room.issue_ticket(1, 8, 1)), first + 1)
+
+    def test_zero_admission_rate_still_issues_tickets(self):
+        ticket = waiting_room.issue_ticket(1, 7, 0)
+        self.assertEqual(waiting_room.read_ticket(ticket, 1)["r"], 1)
+
+
+class DashboardQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        plan = create_plan()
+        participant = create_participant("p@example.com")
+        participant.info = ParticipantInfo.objects.create(
+            first_name="Ali", phone_number="09120000000", national_code="0012345679"
+        )
+        participant.save()
+        Participation.objects.create(participant=participant, plan=plan)
+        token = AccessToken.for_user(participant.user)
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        self.url = reverse("participant-dashboard")
+
+    def test_cold_and_warm_query_counts(self):
+        # User with participant and info, registrations, next event, events
+        # with their plans (prefetched).
+        with self.assertNumQueries(5):
+            cold = self.client.get(self.url, **self.headers)
+        # Only the user and the registrations; the events come from the cache.
+        with self.assertNumQueries(2):
+            warm = self.client.get(self.url, **self.headers)
+        self.assertEqual(cold.status_code, 200)
+        self.assertEqual(warm.json(), cold.json())
+        self.assertEqual(len(cold.json()["events"]), 1)
+        self.assertEqual(len(cold.json()["events"][0]["participations"]), 1)
+
+    def test_query_counts_with_shared_cache(self):
+        # A shared cache also keeps the authenticated user, but not its
+        # participant, which takes the place of the user query.
+        with (
+            tempfile.TemporaryDirectory() as location,
+            override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                        "LOCATION": location,
+                    }
+                }
+            ),
+        ):
+            with self.assertNumQueries(5):
+                self.client.get(self.url, **self.headers)
+            with self.assertNumQueries(2):
+                self.client.get(self.url, **self.headers)
+
+
+class PasswordResetThrottleTests(TestCase):
+    def setUp(self):
+        throttling.get_store.cache_clear()
+        self.addCleanup(throttling.get_store.cache_clear)
+        participant = create_participant("p@example.com")
+        participant.password_reset_code = "0123456789"
+        participant.save()
+
+    def confirm(self, ip):
+        return self.client.put(
+            reverse("password-reset"),
+            {"email": "P@example.com", "token": "9876543210", "password": "x"},
+            content_type="application/json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_confirm_is_limited_per_email_across_ips(self):
+        limit, _ = throttling.parse_rate(
+            settings.AUTH_THROTTLE_RATES["password-reset-confirm"]["email"]
+        )
+        for i in range(limit):
+            self.assertEqual(self.confirm(f"10.0.0.{i}").status_code, 406)
+        self.assertEqual(self.confirm("10.0.1.1").status_code, 429)
+
+
+class ProfileMultipartTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        participant = create_participant("p@example.com")
+        self.info = ParticipantInfo.objects.create(
+            phone_number="09120000000",
+            national_code="0012345679",
+            university="Sharif",
+            department="CE",
+            github="https://github.com/aia",
+        )
+        self.info.image.save("photo.jpg", ContentFile(b"jpeg"))
+        participant.info = self.info
+        participant.save()
+        token = AccessToken.for_user(participant.user)
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        self.url = reverse("dashboard")
+
+    def test_clear_fields_through_multipart(self):
+        response = self.client.patch(
+            self.url,
+            encode_multipart(
+                BOUNDARY, {"image": "", "github": "", "university": "Sharif"}
+            ),
+            content_type=MULTIPART_CONTENT,
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.info.refresh_from_db()
+        self.assertFalse(self.info.image)
+        self.assertFalse(self.info.github)
+        self.assertEqual(self.info.university, "Sharif")
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_upload_spooled_to_disk(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8)).save(buffer, "PNG")
+        image = SimpleUploadedFile(
+            "new.png", buffer.getvalue(), content_type="image/png"
+        )
+        response = self.client.patch(
+            self.url,
+            encode_multipart(BOUNDARY, {"image": image, "university": "Sharif"}),
+            content_type=MULTIPART_CONTENT,
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.info.refresh_from_db()
+        self.assertEqual(self.info.image_status, "P")
+
+
+class AdminChangelistQueryTests(ChangelistQueryTestCase):
+    app_label = "participant"
+
+    def create_row(self, i):
+        plan = create_plan(capacity=10)
+        participant = create_participant(f"p{i}@example.com")
+        participant.info = ParticipantInfo.objects.create(
+            first_name=f"P{i}",
+            phone_number="09120000000",
+            national_code="0012345679",
+        )
+        participant.save()
+        Participation.objects.create(participant=participant, plan=plan)
+        Announcement.objects.create(
+            subject=f"News {i}", body="Hello", event=plan.event, plan=plan
+        )
+
+    def test_participant(self):
+        self.assertChangelistQueries("participant", 4)
+
+    def test_participantinfo(self):
+        self.assertChangelistQueries("participantinfo", 4)
+
+    def test_participation(self):
+        self.assertChangelistQueries("participation", 7)
+
+    def test_participationplan(self):
+        self.assertChangelistQueries("participationplan", 6)
+
+    def test_announcement(self):
+        self.assertChangelistQueries("announcement", 6)
+
+    def test_planstats(self):
+        self.assertChangelistQueries("planstats", 6)
+
+
+class ExportStreamingTests(TestCase):
+    def setUp(self):
+        plan = create_plan()
+        for i in range(3):
+            Participation.objects.create(
+                participant=create_participant(f"p{i}@example.com"), plan=plan
+            )
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.url = reverse("participation-export", args=["csv"]) + "?columns=id,email"
+
+    def test_wsgi_streams_synchronously(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(self.url)
+        self.assertFalse(response.is_async)
+        self.assertEqual(b"".join(response.streaming_content).count(b"@example.com"), 3)
+
+    async def test_asgi_streams_asynchronously(self):
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(self.url)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(content.count(b"@example.com"), 3)
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.participant = create_participant("p@example.com")
+        self.participant.info = ParticipantInfo.objects.create(
+            university="Sharif", phone_number="09120000000", national_code="0012345679"
+        )
+        self.participant.save()
+        token = AccessToken.for_user(self.participant.user)
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        self.url = reverse("dashboard")
+        self.key = profile.profile_cache_key(self.participant.pk)
+
+    def get_university(self):
+        return self.client.get(self.url, **self.headers).json()["university"]
+
+    def assertGetAfterPatch(self):
+        self.assertEqual(self.get_university(), "Sharif")
+        # Invalidation runs on commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.url,
+                {"university": "Tehran"},
+                content_type="application/json",
+                **self.headers,
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.get_university(), "Tehran")
+
+    def test_get_after_patch_with_process_cache(self):
+        self.assertGetAfterPatch()
+        # Other processes would miss the invalidation, so nothing is cached.
+        self.assertIsNone(cache.get(self.key))
+
+    def test_get_after_patch_with_shared_cache(self):
+        with (
+            tempfile.TemporaryDirectory() as location,
+            override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                        "LOCATION": location,
+                    }
+                }
+            ),
+        ):
+            self.assertGetAfterPatch()
+            self.assertEqual(cache.get(self.key)["university"], "Tehran")
+
+
+class AnnouncementTests(TestCase):
+    def test_failed_messages_go_to_the_outbox(self):
+        plan = create_plan()
+        for i in range(ROWS):
+            Participation.objects.create(
+                participant=create_participant(f"p{i}@example.com"), plan=plan
+            )
+        announcement = Announcement.objects.create(
+            subject="News", body="Hello", event=plan.event, status="Q"
+        )
+        original_send = EmailMessage.send
+
+        def send(message, *args, **kwargs):
+            if message.to == ["p1@example.com"]:
+                raise SMTPServerDisconnected("Connection unexpectedly closed")
+            return original_send(message, *args, **kwargs)
+
+        with (
+            mock.patch.object(EmailMessage, "send", autospec=True, side_effect=send),
+            self.assertLogs("participant.announcements", "ERROR"),
+        ):
+            sent = send_announcement(announcement, rate=0)
+
+        announcement.refresh_from_db()
+        self.assertEqual(sent, ROWS - 1)
+        self.assertEqual(announcement.sent_count, ROWS - 1)
+        self.assertEqual(announcement.status, "F")
+        self.assertEqual(len(mail.outbox), ROWS - 1)
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.to, ["p1@example.com"])
+        self.assertEqual(queued.status, "P")
+
+        self.assertEqual(send_outbox_batch(), (1, 0))
+        self.assertEqual(mail.outbox[-1].to, ["p1@example.com"])
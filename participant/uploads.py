@@ -0,0 +1,145 @@
+"""Direct-to-storage uploads for the participant's resume and image.
+
+Instead of streaming the file through a Django worker, the client asks for an
+upload slot, sends the file straight to the storage and then confirms it:
+
+1. ``issue_upload`` picks a fresh ``UniqueUploadPath`` key and returns a form
+   POST target. With S3 this is a presigned POST whose policy pins the key,
+   the content type and the maximum size; with any other storage it points at
+   the local stand-in endpoint, which accepts the same form.
+2. The client POSTs ``fields`` plus the ``file`` to ``url``.
+3. ``confirm_upload`` checks that the object exists, is within the size
+   limit and starts with the magic bytes of an allowed type, then attaches the
+   key to the participant's info. Rejected objects are deleted.
+
+Slots are described by a signed token (``django.core.signing``) bound to the
+user, the field and the key, so a client can only attach what it was issued.
+"""
+
+from django.conf import settings
+from django.core import signing
+from participant.models import ParticipantInfo, UniqueUploadPath
+
+TOKEN_SALT = "participant.upload"
+# Confirmation stays possible for a while after the URL expires, so an upload
+# that started just before the deadline can still be attached.
+CONFIRM_GRACE = 2
+
+UPLOAD_FIELDS = {
+    "resume": {
+        "path": UniqueUploadPath("resumes"),
+        "types": {"application/pdf": [b"%PDF-"]},
+    },
+    "image": {
+        "path": UniqueUploadPath("participants"),
+        "types": {
+            "image/jpeg": [b"\xff\xd8\xff"],
+            "image/png": [b"\x89PNG\r\n\x1a\n"],
+            "image/webp": [b"RIFF"],
+        },
+    },
+}
+
+
+class UploadError(Exception):
+    pass
+
+
+def max_size(field):
+    return settings.UPLOAD_MAX_SIZES[field]
+
+
+def get_storage(field):
+    return ParticipantInfo._meta.get_field(field).storage
+
+
+def is_presigned(storage):
+    return hasattr(storage, "bucket")
+
+
+def issue_upload(user_id, field, filename, content_type, local_url):
+    """Return ``{"url", "fields", "key", "token"}`` for a new upload slot.
+
+    ``local_url(token)`` builds the stand-in endpoint URL for storages that
+    cannot presign.
+    """
+    key = UPLOAD_FIELDS[field]["path"](None, filename)
+    token = signing.dumps(
+        {"u": user_id, "f": field, "k": key, "t": content_type}, salt=TOKEN_SALT
+    )
+    storage = get_storage(field)
+    if is_presigned(storage):
+        post = storage.bucket.meta.client.generate_presigned_post(
+            Bucket=storage.bucket_name,
+            Key=storage._normalize_name(key),
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_size(field)],
+            ],
+            ExpiresIn=settings.UPLOAD_URL_EXPIRY,
+        )
+        url, fields = post["url"], post["fields"]
+    else:
+        url, fields = local_url(token), {"Content-Type": content_type}
+    return {"url": url, "fields": fields, "key": key, "token": token}
+
+
+def read_token(token, user_id=None, confirming=False):
+    """Return the token's payload, or raise ``UploadError``."""
+    max_age = settings.UPLOAD_URL_EXPIRY
+    if confirming:
+        max_age *= CONFIRM_GRACE
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    except signing.BadSignature:
+        raise UploadError("Upload token is invalid or expired.")
+    if user_id is not None and data["u"] != user_id:
+        raise UploadError("Upload token is invalid or expired.")
+    return data
+
+
+def store_local(data, file):
+    """Stand-in for the presigned POST when the storage is not S3."""
+    if file.size > max_size(data["f"]):
+        raise UploadError("File is too large.")
+    if file.content_type != data["t"]:
+        raise UploadError("File type does not match the upload slot.")
+    storage = get_storage(data["f"])
+    if storage.exists(data["k"]):
+        raise UploadError("This upload slot has already been used.")
+    storage.save(data["k"], file)
+
+
+def _read_head(storage, key, length=16):
+    if is_presigned(storage):
+        obj = storage.bucket.Object(storage._normalize_name(key))
+        return obj.get(Range=f"bytes=0-{length - 1}")["Body"].read()
+    with storage.open(key, "rb") as f:
+        return f.read(length)
+
+
+def confirm_upload(info, data):
+    """Validate the uploaded object and attach it to ``info``."""
+    field, key = data["f"], data["k"]
+    storage = get_storage(field)
+    if not storage.exists(key):
+        raise UploadError("File has not been uploaded.")
+    size = storage.size(key)
+    head = _read_head(storage, key)
+    signatures = UPLOAD_FIELDS[field]["types"].get(data["t"], [])
+    if not 0 < size <= max_size(field):
+        error = "File is too large."
+    elif not any(head.startswith(signature) for signature in signatures):
+        error = "File content does not match its type."
+    elif data["t"] == "image/webp" and head[8:12] != b"WEBP":
+        error = "File content does not match its type."
+    else:
+        error = None
+    if error:
+        storage.delete(key)
+        raise UploadError(error)
+
+    setattr(info, field, key)
+    info.save()
+    return info
@@ -1,3 +1,4 @@
+from core.async_views import async_reads
 from django.urls import path
 from participant import views
 
@@ -13,17 +14,54 @@ urlpatterns = [
     ),
     path(
         "profile/",
-        views.ParticipantInfoRetrieveUpdateAPIView.as_view(),
+        async_reads(views.ParticipantInfoRetrieveUpdateAPIView, views.read_profile),
         name="dashboard",
     ),
+    path(
+        "overview/",
+        views.ParticipantDashboardAPIView.as_view(),
+        name="participant-dashboard",
+    ),
+    path("search/", views.ParticipantSearchAPIView.as_view(), name="search"),
+    path(
+        "export/<str:file_format>/",
+        views.ParticipationExportAPIView.as_view(),
+        name="participation-export",
+    ),
+    path("upload/", views.ParticipantUploadAPIView.as_view(), name="upload"),
+    path(
+        "upload/confirm/",
+        views.ParticipantUploadConfirmAPIView.as_view(),
+        name="upload-confirm",
+    ),
+    path(
+        "upload/local/<str:token>/",
+        views.LocalUploadAPIView.as_view(),
+        name="upload-local",
+    ),
     path(
         "participation/<int:event_id>/",
-        views.ParticipationByEventAPIView.as_view(),
+        async_reads(views.ParticipationByEventAPIView, views.read_participations),
         name="participation",
     ),
     path(
         "plan/<int:event_id>/",
-        views.ParticipationPlanByEventAPIView.as_view(),
+        async_reads(views.ParticipationPlanByEventAPIView, views.read_plans),
         name="plan",
     ),
+    path(
+        "stats/<int:event_id>/",
+        views.EventStatsAPIView.as_view(),
+        name="event-stats",
+    ),
+    path(
+        "waiting-room/<int:event_id>/",
+        views.WaitingRoomTicketAPIView.as_view(),
+        name="waiting-room",
+    ),
+    path(
+        "waiting-room/<int:event_id>/status/",
+        views.WaitingRoomStatusAPIView.as_view(),
+        name="waiting-room-status",
+    ),
 ]
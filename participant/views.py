@@ -1,28 +1,93 @@
+from collections import defaultdict
 from random import choices
 
+from core import hashing, throttling
+from core.async_views import handle_api_errors, json_response
+from core.cache import cached_queryset
+from core.http import conditional_get
+from core.mail import enqueue_email
+from core.models import Event, filter_by_email
+from core.views import get_next_event_data
 from django.conf import settings
-from django.core.mail import EmailMessage
-from django.http import Http404
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from participant.models import Participant, Participation, ParticipationPlan
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from participant import profile, uploads, waiting_room
+from participant.authentication import async_login_required
+from participant.catalog import aget_plan_catalog, dashboard_events, get_plan_catalog
+from participant.export import DEFAULT_COLUMNS, FORMATS, export_participations
+from participant.models import (
+    Participant,
+    ParticipantInfo,
+    Participation,
+    ParticipationPlan,
+)
+from participant.search import search_participants
 from participant.serializers import (
+    DashboardEventSerializer,
     ParticipantInfoSerializer,
+    ParticipantSearchSerializer,
     ParticipantSerializer,
+    ParticipationCreateSerializer,
+    ParticipationExportSerializer,
     ParticipationPlanSerializer,
     ParticipationSerializer,
     PasswordChangeSerializer,
     PasswordResetConfirmSerializer,
     PasswordResetRequestSerializer,
+    UploadConfirmSerializer,
+    UploadRequestSerializer,
 )
+from participant.stats import event_stats
 from rest_framework import generics, permissions, status, views
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
 
 
+def plan_validators(request, event_id):
+    catalog = get_plan_catalog(event_id)
+    return catalog["etag"], catalog["last_modified"]
+
+
+async def aplan_validators(request, event_id):
+    catalog = await aget_plan_catalog(event_id)
+    return catalog["etag"], catalog["last_modified"]
+
+
+def get_participant(user):
+    """Return the user's participant with its info, preloaded by
+    ParticipantJWTAuthentication unless the user came from its cache."""
+    if not User.participant.is_cached(user):
+        participant = (
+            Participant.objects.select_related("info").filter(user=user).first()
+        )
+        User.participant.related.set_cached_value(user, participant)
+    try:
+        return user.participant
+    except Participant.DoesNotExist:
+        raise Http404
+
+
+async def aget_participant(user):
+    """Async ``get_participant``."""
+    if not User.participant.is_cached(user):
+        participant = (
+            await Participant.objects.select_related("info").filter(user=user).afirst()
+        )
+        User.participant.related.set_cached_value(user, participant)
+    return get_participant(user)
+
+
 class ParticipantCreateAPIView(generics.CreateAPIView):
     queryset = Participant.objects.all()
     serializer_class = ParticipantSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [throttling.IPRateThrottle, throttling.EmailRateThrottle]
+    throttle_scope = "sign-up"
 
     @extend_schema(
         request=ParticipantSerializer,
@@ -47,27 +112,85 @@ class ParticipantCreateAPIView(generics.CreateAPIView):
         responses={200: ParticipantInfoSerializer},
         description="Update the authenticated participant's personal info",
     ),
+    patch=extend_schema(
+        request=ParticipantInfoSerializer,
+        responses={200: ParticipantInfoSerializer},
+        description=(
+            "Update only the given fields of the authenticated participant's "
+            "personal info; unchanged values are neither validated nor written"
+        ),
+    ),
 )
 class ParticipantInfoRetrieveUpdateAPIView(generics.RetrieveUpdateAPIView):
     queryset = Participant.objects.all()
     serializer_class = ParticipantInfoSerializer
     permission_classes = [permissions.IsAuthenticated]
-    http_method_names = ["get", "put", "head", "options"]
+    http_method_names = ["get", "put", "patch", "head", "options"]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_object(self):
-        try:
-            participant = Participant.objects.get(user=self.request.user)
-        except Participant.DoesNotExist:
+        participant = (
+            Participant.objects.select_related("user", "info")
+            .filter(user=self.request.user, info__isnull=False)
+            .first()
+        )
+        if participant is None:
             raise Http404
         self.check_object_permissions(self.request, participant)
+        self.participant = participant
         return participant.info
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if hasattr(self, "participant"):
+            context["email"] = self.participant.user.email
+        return context
+
+    def retrieve(self, request, *args, **kwargs):
+        participant = get_participant(request.user)
+        data = profile.get_cached_profile(participant.pk)
+        if data is None:
+            data = super().retrieve(request, *args, **kwargs).data
+            profile.set_cached_profile(participant.pk, data)
+        return Response(data)
+
+
+@handle_api_errors
+@async_login_required
+async def read_profile(request):
+    """ASGI-native GET of ``ParticipantInfoRetrieveUpdateAPIView``."""
+    participant = await aget_participant(request.user)
+    data = await profile.aget_cached_profile(participant.pk)
+    if data is None:
+        # Like get_object of the sync view: the info and the email are read
+        # fresh, never from the user cached by the authentication.
+        participant = (
+            await Participant.objects.select_related("user", "info")
+            .filter(pk=participant.pk, info__isnull=False)
+            .afirst()
+        )
+        if participant is None:
+            raise Http404
+        data = ParticipantInfoSerializer(
+            participant.info,
+            context={"request": request, "email": participant.user.email},
+        ).data
+        await profile.aset_cached_profile(participant.pk, data)
+    return json_response(data)
+
 
 class PasswordResetAPIView(views.APIView):
     permission_classes = [
         permissions.AllowAny,
     ]
+    throttle_classes = [throttling.IPRateThrottle, throttling.EmailRateThrottle]
+    throttle_scope = "password-reset"
+
+    def get_throttles(self):
+        # Confirming a code has its own budget, separate from sending emails.
+        if self.request.method == "PUT":
+            self.throttle_scope = "password-reset-confirm"
+        return super().get_throttles()
 
     @extend_schema(
         request=PasswordResetRequestSerializer,
@@ -76,33 +199,30 @@ class PasswordResetAPIView(views.APIView):
     )
     def post(self, request):
         try:
-            participant = Participant.objects.get(user__email=request.data["email"])
+            participant = filter_by_email(
+                Participant.objects.select_related("user"),
+                request.data["email"],
+                field="user__email",
+            ).get()
         except Participant.DoesNotExist:
             raise Http404
-        except Participant.MultipleObjectsReturned:
-            return Response(
-                "Multiple users found with this email address",
-                status=status.HTTP_400_BAD_REQUEST,
-            )
         participant.password_reset_code = "".join(
             choices([str(i) for i in range(10)], k=10)
         )
-        participant.save()
 
         reset_link = (
             f"https://aia-sharif.com/reset-password/{participant.password_reset_code}"
         )
         message = f"Your AIA password reset link is: {reset_link}"
 
-        email = EmailMessage(
-            subject="AIA Password Reset",
-            body=message,
-            from_email=settings.SERVER_EMAIL,
-            to=[participant.user.email],
-            headers={"x-liara-tag": "password-reset"},
-        )
-
-        email.send(fail_silently=False)
+        with transaction.atomic():
+            participant.save()
+            enqueue_email(
+                subject="AIA Password Reset",
+                body=message,
+                to=[participant.user.email],
+                headers={"x-liara-tag": "password-reset"},
+            )
 
         return Response(
             f"Password reset code sent to the email address ({participant.user.email})",
@@ -116,14 +236,13 @@ class PasswordResetAPIView(views.APIView):
     )
     def put(self, request):
         try:
-            participant = Participant.objects.get(user__email=request.data["email"])
+            participant = filter_by_email(
+                Participant.objects.select_related("user"),
+                request.data["email"],
+                field="user__email",
+            ).get()
         except Participant.DoesNotExist:
             raise Http404
-        except Participant.MultipleObjectsReturned:
-            return Response(
-                "Mutiple Users found with this Email Address",
-                status=status.HTTP_400_BAD_REQUEST,
-            )
         if not participant.password_reset_code:
             return Response(
                 "Password reset code is not set for this user. "
@@ -131,8 +250,8 @@ class PasswordResetAPIView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         elif participant.password_reset_code == request.data["token"]:
-            participant.user.set_password(request.data["password"])
-            participant.user.save()
+            hashing.set_password(participant.user, request.data["password"])
+            participant.user.save(update_fields=["password"])
             participant.password_reset_code = None
             participant.save()
             return Response("Password reset successfully", status=status.HTTP_200_OK)
@@ -152,13 +271,12 @@ class ParticipantPasswordChangeAPIView(views.APIView):
         description="Change password for authenticated participant (PUT).",
     )
     def put(self, request):
-        participant = Participant.objects.get(user=request.user)
-        if not participant.user.check_password(request.data["old_password"]):
+        if not hashing.check_user_password(request.user, request.data["old_password"]):
             return Response(
                 "Old password is not correct", status=status.HTTP_406_NOT_ACCEPTABLE
             )
-        participant.user.set_password(request.data["new_password"])
-        participant.user.save()
+        hashing.set_password(request.user, request.data["new_password"])
+        request.user.save(update_fields=["password"])
         return Response("Password changed successfully", status=status.HTTP_200_OK)
 
 
@@ -166,11 +284,19 @@ class ParticipantPasswordChangeAPIView(views.APIView):
     get=extend_schema(
         responses={200: ParticipationSerializer(many=True)},
         description="List participations for the authenticated participant for a given event",
-    )
+    ),
+    post=extend_schema(
+        request=ParticipationCreateSerializer,
+        responses={201: ParticipationSerializer},
+        description="Register the authenticated participant for a plan of the event",
+    ),
 )
 class ParticipationByEventAPIView(generics.ListAPIView):
     serializer_class = ParticipationSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [
+        permissions.IsAuthenticated,
+        waiting_room.WaitingRoomAdmission,
+    ]
 
     def get_queryset(self):
         return Participation.objects.filter(
@@ -178,12 +304,38 @@ class ParticipationByEventAPIView(generics.ListAPIView):
         )
 
     def get(self, request, *args, **kwargs):
-        try:
-            self.kwargs["participant"] = Participant.objects.get(user=self.request.user)
-        except Participant.DoesNotExist:
-            raise Http404
+        self.kwargs["participant"] = get_participant(self.request.user)
         return self.list(request, *args, **kwargs)
 
+    def post(self, request, *args, **kwargs):
+        serializer = ParticipationCreateSerializer(
+            data=request.data,
+            context={
+                "participant": get_participant(request.user),
+                "event_id": self.kwargs["event_id"],
+            },
+        )
+        serializer.is_valid(raise_exception=True)
+        participation = serializer.save()
+        return Response(
+            ParticipationSerializer(participation).data, status=status.HTTP_201_CREATED
+        )
+
+
+@handle_api_errors
+@async_login_required
+async def read_participations(request, event_id):
+    """ASGI-native GET of ``ParticipationByEventAPIView``."""
+    participant = await aget_participant(request.user)
+    # Same shape as ParticipationSerializer, without loading the plans.
+    data = [
+        {"plan": plan_id}
+        async for plan_id in Participation.objects.filter(
+            plan__event=event_id, participant=participant
+        ).values_list("plan_id", flat=True)
+    ]
+    return json_response(data)
+
 
 @extend_schema_view(
     get=extend_schema(
@@ -191,9 +343,276 @@ class ParticipationByEventAPIView(generics.ListAPIView):
         description="List available participation plans for an event",
     )
 )
+@method_decorator(conditional_get(plan_validators), name="get")
 class ParticipationPlanByEventAPIView(generics.ListAPIView):
     queryset = ParticipationPlan.objects.all()
     serializer_class = ParticipationPlanSerializer
 
     def get_queryset(self):
         return ParticipationPlan.objects.filter(event=self.kwargs["event_id"])
+
+    def get(self, request, event_id, *args, **kwargs):
+        catalog = get_plan_catalog(event_id)
+        return HttpResponse(catalog["content"], content_type="application/json")
+
+
+@conditional_get(aplan_validators)
+async def read_plans(request, event_id):
+    """ASGI-native GET of ``ParticipationPlanByEventAPIView``."""
+    catalog = await aget_plan_catalog(event_id)
+    return HttpResponse(catalog["content"], content_type="application/json")
+
+
+class WaitingRoomTicketAPIView(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        request=None,
+        responses={201: dict, 404: None},
+        description=(
+            "Join the event's waiting room. Send the returned ticket in the "
+            "X-Waiting-Room-Ticket header when registering."
+        ),
+    )
+    def post(self, request, event_id):
+        config = waiting_room.get_config(event_id)
+        if not config:
+            raise Http404
+        _, admission_rate = config
+        ticket = waiting_room.issue_ticket(event_id, request.user.pk, admission_rate)
+        data = waiting_room.read_ticket(ticket, event_id)
+        return Response(
+            {"ticket": ticket, **waiting_room.ticket_status(data)},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class WaitingRoomStatusAPIView(views.APIView):
+    # Position checks are answered from the signed ticket alone: no
+    # authentication, database or counter store access.
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(
+        request=None,
+        responses={200: dict, 400: str},
+        description="Queue position of the ticket sent in X-Waiting-Room-Ticket",
+    )
+    def get(self, request, event_id):
+        data = waiting_room.read_ticket(
+            request.META.get(waiting_room.TICKET_HEADER, ""), event_id
+        )
+        if data is None:
+            return Response(
+                "Waiting room ticket is invalid or expired.",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(waiting_room.ticket_status(data), status=status.HTTP_200_OK)
+
+
+class ParticipantDashboardAPIView(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        responses={200: dict},
+        description=(
+            "Everything the participant dashboard needs in one call: personal "
+            "info, the events the participant registered for (plus the next "
+            "event) with their plans and registrations, and the next event"
+        ),
+    )
+    def get(self, request):
+        participant = get_participant(request.user)
+
+        participations = defaultdict(list)
+        for participation in Participation.objects.filter(
+            participant=participant
+        ).select_related("plan"):
+            participations[participation.plan.event_id].append(participation)
+
+        next_event = get_next_event_data()
+        event_ids = set(participations)
+        if next_event:
+            event_ids.add(next_event["id"])
+        events = cached_queryset(
+            dashboard_events,
+            ",".join(str(event_id) for event_id in sorted(event_ids)),
+            Event.objects.filter(id__in=event_ids)
+            .order_by("starting_date")
+            .prefetch_related(
+                Prefetch(
+                    "participationplan_set",
+                    queryset=ParticipationPlan.objects.select_related(
+                        "mode_of_attendance"
+                    ).order_by("id"),
+                )
+            ),
+            settings.PLAN_CATALOG_CACHE_TIMEOUT,
+        )
+
+        info = None
+        if participant.info:
+            info = ParticipantInfoSerializer(
+                participant.info,
+                context={"request": request, "email": request.user.email},
+            ).data
+        return Response(
+            {
+                "info": info,
+                "events": DashboardEventSerializer(
+                    events, many=True, context={"participations": participations}
+                ).data,
+                "next_event": next_event,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ParticipantUploadAPIView(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        request=UploadRequestSerializer,
+        responses={201: dict, 400: dict},
+        description=(
+            "Get an upload slot for the resume or image. POST the returned "
+            "fields together with the file (as `file`) to the returned url, "
+            "then confirm the upload with the token."
+        ),
+    )
+    def post(self, request):
+        serializer = UploadRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        get_participant(request.user)
+        slot = uploads.issue_upload(
+            request.user.pk,
+            serializer.validated_data["field"],
+            serializer.validated_data["filename"],
+            serializer.validated_data["content_type"],
+            lambda token: request.build_absolute_uri(
+                reverse("upload-local", args=[token])
+            ),
+        )
+        return Response(slot, status=status.HTTP_201_CREATED)
+
+
+class ParticipantUploadConfirmAPIView(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        request=UploadConfirmSerializer,
+        responses={200: ParticipantInfoSerializer, 400: str},
+        description="Validate an uploaded file and attach it to the profile",
+    )
+    def post(self, request):
+        serializer = UploadConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        info = ParticipantInfo.objects.filter(participant__user=request.user).first()
+        if info is None:
+            raise Http404
+        try:
+            data = uploads.read_token(
+                serializer.validated_data["token"], request.user.pk, confirming=True
+            )
+            info = uploads.confirm_upload(info, data)
+        except uploads.UploadError as e:
+            return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            ParticipantInfoSerializer(
+                info, context={"request": request, "email": request.user.email}
+            ).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+class LocalUploadAPIView(views.APIView):
+    # Stand-in for a presigned storage POST when files are kept on the local
+    # filesystem; the signed token in the URL is the only credential.
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    parser_classes = [MultiPartParser]
+
+    @extend_schema(
+        request={"multipart/form-data": dict},
+        responses={204: None, 400: str},
+        description="Local upload target returned by the upload endpoint",
+    )
+    def post(self, request, token):
+        file = request.FILES.get("file")
+        if file is None:
+            return Response("No file was sent.", status=status.HTTP_400_BAD_REQUEST)
+        try:
+            uploads.store_local(uploads.read_token(token), file)
+        except uploads.UploadError as e:
+            return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        parameters=[
+            OpenApiParameter("q", str, description="Words to match"),
+            OpenApiParameter("limit", int, description="At most 50, default 20"),
+        ],
+        responses={200: ParticipantSearchSerializer(many=True)},
+        description=(
+            "Staff search/autocomplete over participants' email, names (English "
+            "and Persian), national code and phone number"
+        ),
+    )
+)
+class ParticipantSearchAPIView(generics.ListAPIView):
+    serializer_class = ParticipantSearchSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = None
+
+    def get_queryset(self):
+        term = self.request.query_params.get("q", "").strip()
+        if not term:
+            return Participant.objects.none()
+        try:
+            limit = min(int(self.request.query_params.get("limit", 20)), 50)
+        except ValueError:
+            limit = 20
+        return search_participants(
+            Participant.objects.select_related("user", "info"), term
+        ).order_by("id")[: max(limit, 1)]
+
+
+class ParticipationExportAPIView(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        parameters=[ParticipationExportSerializer],
+        responses={(200, "text/csv"): bytes, 400: dict, 404: None},
+        description=(
+            "Stream registrations with participant info as csv or xlsx, "
+            "optionally filtered by event, plan or lunch and limited to the "
+            "given columns"
+        ),
+    )
+    def get(self, request, file_format):
+        if file_format not in FORMATS:
+            raise Http404
+        serializer = ParticipationExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return export_participations(
+            request,
+            serializer.filter(Participation.objects.all()),
+            file_format,
+            serializer.validated_data.get("columns", DEFAULT_COLUMNS),
+        )
+
+
+class EventStatsAPIView(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        responses={200: dict},
+        description=(
+            "Registrations, lunch count and revenue per plan of the event, "
+            "with totals"
+        ),
+    )
+    def get(self, request, event_id):
+        return Response(event_stats(event_id), status=status.HTTP_200_OK)
@@ -0,0 +1,138 @@
+"""Virtual waiting room in front of event registration.
+
+When an event's waiting room is on, a participant first asks for a ticket.
+Issuing one assigns the next one-second admission slot that still has room
+for ``Event.admission_rate`` users, using counters in the shared cache
+(``CACHE_URL``) rather than the database. The counters must be shared by every
+process serving the API: with the default per-process ``locmemcache://`` each
+process admits ``admission_rate`` users per second on its own. A user holds one
+slot per event for as long as a ticket lives, so asking again does not take
+more slots. The slot is written into an HMAC-signed ticket
+(``django.core.signing``), so checking a ticket's position or admitting it only
+needs the ticket itself: no database or counter store access at all.
+"""
+
+import math
+import time
+from functools import cache
+
+from core.cache import CacheNamespace
+from core.models import Event
+from core.throttling import CacheThrottleStore
+from django.conf import settings
+from django.core import signing
+from rest_framework import permissions
+
+TICKET_SALT = "participant.waiting-room"
+TICKET_HEADER = "HTTP_X_WAITING_ROOM_TICKET"
+
+
+waiting_room_configs = CacheNamespace("participant:waiting-room")
+
+
+def get_config(event_id):
+    """``(enabled, admission_rate)`` for the event, or ``None`` if it does not
+    exist. Cached so the registration surge does not re-read the event row."""
+
+    def load():
+        event = (
+            Event.objects.filter(pk=event_id)
+            .values_list("waiting_room_enabled", "admission_rate")
+            .first()
+        )
+        return tuple(event) if event else ()
+
+    config = waiting_room_configs.get_or_set(
+        event_id, load, settings.WAITING_ROOM_TICKET_MAX_AGE
+    )
+    return config or None
+
+
+@cache
+def get_store():
+    # Not AUTH_THROTTLE_STORE: with per-process counters every process would
+    # admit admission_rate users per second on its own.
+    return CacheThrottleStore()
+
+
+def reserve_slot(store, event_id, admission_rate):
+    """Take a place in the first slot from now on that still has room.
+
+    The head is a hint of the first slot that may have room, so callers skip
+    the full ones. It only moves forward: the one caller that wins ``add`` on
+    the value it read advances it with ``incr``, so the head is never
+    overwritten by a caller that read it earlier.
+    """
+    now = int(time.time())
+    head_key = f"waiting-room:{event_id}:head"
+    head = store.get_many([head_key]).get(head_key, 0)
+    slot = max(now, head)
+    while True:
+        count = store.incr(
+            f"waiting-room:{event_id}:slot:{slot}", timeout=slot - now + 60
+        )
+        if count <= admission_rate:
+            break
+        slot += 1
+    if slot > head and store.add(f"{head_key}:moved:{head}", 1, timeout=60):
+        store.incr(
+            head_key, delta=slot - head, timeout=settings.WAITING_ROOM_TICKET_MAX_AGE
+        )
+    return slot
+
+
+def issue_ticket(event_id, user_id, admission_rate):
+    store = get_store()
+    # A rate below 1 would never find a slot with room.
+    admission_rate = max(admission_rate, 1)
+    user_key = f"waiting-room:{event_id}:user:{user_id}"
+    slot = store.get_many([user_key]).get(user_key)
+    if slot is None:
+        slot = reserve_slot(store, event_id, admission_rate)
+        if not store.add(user_key, slot, settings.WAITING_ROOM_TICKET_MAX_AGE):
+            # A concurrent request of the same user reserved one first.
+            slot = store.get_many([user_key]).get(user_key, slot)
+    data = {"e": event_id, "u": user_id, "a": slot, "r": admission_rate}
+    return signing.dumps(data, salt=TICKET_SALT)
+
+
+def read_ticket(ticket, event_id, user_id=None):
+    """Return the ticket's payload, or ``None`` if it is invalid, expired or was
+    issued for another event or user."""
+    try:
+        data = signing.loads(
+            ticket, salt=TICKET_SALT, max_age=settings.WAITING_ROOM_TICKET_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    if data.get("e") != event_id or (user_id is not None and data.get("u") != user_id):
+        return None
+    return data
+
+
+def ticket_status(data):
+    wait = max(0.0, data["a"] - time.time())
+    return {
+        "admitted": wait == 0,
+        "position": math.ceil(wait) * data["r"],
+        "retry_after": math.ceil(wait),
+    }
+
+
+class WaitingRoomAdmission(permissions.BasePermission):
+    """Let writes through only with an admitted ticket in the
+    ``X-Waiting-Room-Ticket`` header while the event's waiting room is on."""
+
+    message = "A waiting room ticket that has been admitted is required."
+
+    def has_permission(self, request, view):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        event_id = view.kwargs["event_id"]
+        config = get_config(event_id)
+        if not config or not config[0]:
+            return True
+        data = read_ticket(
+            request.META.get(TICKET_HEADER, ""), event_id, request.user.pk
+        )
+        return data is not None and ticket_status(data)["admitted"]
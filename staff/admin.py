@@ -1,4 +1,7 @@
 from django.contrib import admin
+from django.db.models import Count
+from participant.admin import ParticipantSearchMixin
+from participant.models import Participant
 from staff.models import StaffTeam, StaffTeamMember
 
 
@@ -8,27 +11,47 @@ class StaffTeamMemberInline(admin.TabularInline):
     autocomplete_fields = ["staff"]
     fields = ("staff", "role")
 
+    def get_queryset(self, request):
+        # Each row is labelled with StaffTeamMember.__str__.
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("staff__user", "staff__info", "staff_team__event")
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # The autocomplete widget labels each selected staff with its __str__,
+        # which reads the user and the info.
+        if db_field.name == "staff":
+            kwargs["queryset"] = Participant.objects.select_related("user", "info")
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
 
 @admin.register(StaffTeam)
 class StaffTeamAdmin(admin.ModelAdmin):
     list_display = ("name", "event", "description", "member_count")
     list_filter = ("event",)
+    list_select_related = ("event",)
     search_fields = ("name", "description")
     inlines = [StaffTeamMemberInline]
 
-    def member_count(self, obj):
-        return obj.members.count()
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(member_count=Count("members"))
 
-    member_count.short_description = "Members"
+    @admin.display(description="Members", ordering="member_count")
+    def member_count(self, obj):
+        return obj.member_count
 
 
 @admin.register(StaffTeamMember)
-class StaffTeamMemberAdmin(admin.ModelAdmin):
+class StaffTeamMemberAdmin(ParticipantSearchMixin, admin.ModelAdmin):
     list_display = ("staff", "staff_team", "role")
     list_filter = ("role", "staff_team__name", "staff_team__event")
+    list_select_related = ("staff__user", "staff__info", "staff_team__event")
     search_fields = (
         "staff__user__email",
         "staff__info__first_name",
         "staff__info__last_name",
     )
+    participant_path = "staff__"
     autocomplete_fields = ["staff", "staff_team"]
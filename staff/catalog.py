@@ -0,0 +1,66 @@
+"""Per-event staff teams served as pre-rendered JSON.
+
+Like the plan catalog, the teams of an event are loaded once, rendered with
+``JSONRenderer`` and cached with their validators, so the public endpoint
+neither queries nor runs the nested serializers. Signals in ``staff.signals``
+drop the entry when a team, a membership, or a staff member's info or email
+changes. The timeout also bounds the age of the signed image URLs embedded in
+the payload.
+"""
+
+import hashlib
+
+from core.cache import CacheNamespace
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from staff.models import StaffTeam
+from staff.serializers import StaffTeamSerializer
+
+team_catalogs = CacheNamespace("staff:team-catalog")
+
+
+def _team_queryset(event_id):
+    return StaffTeam.objects.filter(event_id=event_id).prefetch_related(
+        "members__staff__user", "members__staff__info"
+    )
+
+
+def _render_team_catalog(teams):
+    content = JSONRenderer().render(StaffTeamSerializer(teams, many=True).data)
+    changes = [team.updated_time for team in teams]
+    for team in teams:
+        for member in team.members.all():
+            changes.append(member.updated_time)
+            if member.staff.info:
+                changes.append(member.staff.info.updated_time)
+    return {
+        "content": content,
+        "etag": hashlib.md5(content).hexdigest(),
+        "last_modified": max(changes, default=None),
+    }
+
+
+def build_team_catalog(event_id):
+    return _render_team_catalog(list(_team_queryset(event_id)))
+
+
+def get_team_catalog(event_id):
+    return team_catalogs.get_or_set(
+        event_id,
+        lambda: build_team_catalog(event_id),
+        settings.STAFF_TEAMS_CACHE_TIMEOUT,
+    )
+
+
+async def aget_team_catalog(event_id):
+    async def build():
+        # Async iteration runs the prefetches too, so rendering does not query.
+        return _render_team_catalog([team async for team in _team_queryset(event_id)])
+
+    return await team_catalogs.aget_or_set(
+        event_id, build, settings.STAFF_TEAMS_CACHE_TIMEOUT
+    )
+
+
+def drop_team_catalogs(event_ids):
+    team_catalogs.delete_many(event_ids)
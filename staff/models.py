@@ -9,6 +9,7 @@ class StaffTeam(models.Model):
     event = models.ForeignKey(
         Event, on_delete=models.CASCADE, related_name="staff_teams"
     )
+    updated_time = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return f"{self.event} - {self.name}"
@@ -27,6 +28,7 @@ class StaffTeamMember(models.Model):
         StaffTeam, on_delete=models.CASCADE, related_name="members"
     )
     role = models.CharField(max_length=1, default="M", choices=ROLE_CHOICES)
+    updated_time = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return f"{self.staff} - {self.role} of {self.staff_team} Team"
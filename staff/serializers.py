@@ -1,3 +1,4 @@
+from participant.images import variant_urls
 from rest_framework import serializers
 from staff.models import StaffTeam, StaffTeamMember
 
@@ -9,6 +10,7 @@ class StaffTeamMemberSerializer(serializers.ModelSerializer):
     last_name = serializers.CharField(source="staff.info.last_name", read_only=True)
     github = serializers.URLField(source="staff.info.github", read_only=True)
     linkedin = serializers.URLField(source="staff.info.linkedin", read_only=True)
+    image = serializers.SerializerMethodField()
 
     class Meta:
         model = StaffTeamMember
@@ -19,9 +21,16 @@ class StaffTeamMemberSerializer(serializers.ModelSerializer):
             "last_name",
             "github",
             "linkedin",
+            "image",
             "role",
         )
 
+    def get_image(self, obj) -> dict:
+        """Small thumbnail as ``{"webp": url, "jpeg": url}``, once processed."""
+        if not obj.staff.info or not obj.staff.info.image:
+            return None
+        return variant_urls(obj.staff.info, "small", self.context.get("request"))
+
 
 class StaffTeamSerializer(serializers.ModelSerializer):
     members = StaffTeamMemberSerializer(many=True, read_only=True)
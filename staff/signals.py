@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from participant.models import ParticipantInfo
+from staff.catalog import drop_team_catalogs
+from staff.models import StaffTeam, StaffTeamMember
+
+
+def invalidate_team_catalogs(event_ids):
+    event_ids = set(event_ids) - {None}
+    if event_ids:
+        transaction.on_commit(lambda: drop_team_catalogs(event_ids))
+
+
+@receiver(pre_save, sender=StaffTeam)
+def remember_team_event(sender, instance, **kwargs):
+    # A team moved to another event must also leave the old event's catalog.
+    instance._previous_event_id = (
+        StaffTeam.objects.filter(pk=instance.pk)
+        .values_list("event_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver([post_save, post_delete], sender=StaffTeam)
+def invalidate_for_team(sender, instance, **kwargs):
+    previous_event_id = getattr(instance, "_previous_event_id", None)
+    invalidate_team_catalogs({instance.event_id, previous_event_id})
+
+
+@receiver(pre_save, sender=StaffTeamMember)
+def remember_member_team(sender, instance, **kwargs):
+    instance._previous_team_id = (
+        StaffTeamMember.objects.filter(pk=instance.pk)
+        .values_list("staff_team_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver([post_save, post_delete], sender=StaffTeamMember)
+def invalidate_for_member(sender, instance, **kwargs):
+    team_ids = {instance.staff_team_id, getattr(instance, "_previous_team_id", None)}
+    invalidate_team_catalogs(
+        StaffTeam.objects.filter(pk__in=team_ids - {None}).values_list(
+            "event_id", flat=True
+        )
+    )
+
+
+@receiver([post_save, pre_delete], sender=ParticipantInfo)
+def invalidate_for_info(sender, instance, **kwargs):
+    invalidate_team_catalogs(
+        StaffTeam.objects.filter(members__staff__info=instance)
+        .values_list("event_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_save, sender=User)
+def invalidate_for_user(sender, instance, update_fields=None, **kwargs):
+    # Team listings only show the email; sign-ins save last_login alone.
+    if update_fields is not None and "email" not in update_fields:
+        return
+    invalidate_team_catalogs(
+        StaffTeam.objects.filter(members__staff__user=instance)
+        .values_list("event_id", flat=True)
+        .distinct()
+    )
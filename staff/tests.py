@@ -0,0 +1,24 @@
+from core.testing import ChangelistQueryTestCase
+from participant.models import ParticipantInfo
+from participant.tests import create_participant, create_plan
+from staff.models import StaffTeam, StaffTeamMember
+
+
+class AdminChangelistQueryTests(ChangelistQueryTestCase):
+    app_label = "staff"
+
+    def create_row(self, i):
+        team = StaffTeam.objects.create(name=f"Team {i}", event=create_plan().event)
+        for j in range(2):
+            staff = create_participant(f"s{i}{j}@example.com")
+            staff.info = ParticipantInfo.objects.create(
+                first_name=f"S{i}{j}", phone_number="09120000000"
+            )
+            staff.save()
+            StaffTeamMember.objects.create(staff=staff, staff_team=team)
+
+    def test_staffteam(self):
+        self.assertChangelistQueries("staffteam", 6)
+
+    def test_staffteammember(self):
+        self.assertChangelistQueries("staffteammember", 7)
@@ -1,10 +1,11 @@
+from core.async_views import async_reads
 from django.urls import path
 from staff import views
 
 urlpatterns = [
     path(
         "teams/<int:event_id>/",
-        views.StaffTeamsByEventAPIView.as_view(),
+        async_reads(views.StaffTeamsByEventAPIView, views.read_staff_teams),
         name="staff-teams-by-event",
     ),
 ]
@@ -1,15 +1,30 @@
+from core.http import conditional_get
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import generics, permissions
+from staff.catalog import aget_team_catalog, get_team_catalog
 from staff.models import StaffTeam
 from staff.serializers import StaffTeamSerializer
 
 
+def staff_teams_validators(request, event_id):
+    catalog = get_team_catalog(event_id)
+    return catalog["etag"], catalog["last_modified"]
+
+
+async def astaff_teams_validators(request, event_id):
+    catalog = await aget_team_catalog(event_id)
+    return catalog["etag"], catalog["last_modified"]
+
+
 @extend_schema_view(
     get=extend_schema(
         responses={200: StaffTeamSerializer(many=True)},
         description="List all staff teams with their members for a given event",
     )
 )
+@method_decorator(conditional_get(staff_teams_validators), name="get")
 class StaffTeamsByEventAPIView(generics.ListAPIView):
     serializer_class = StaffTeamSerializer
     permission_classes = [permissions.AllowAny]
@@ -19,3 +34,14 @@ class StaffTeamsByEventAPIView(generics.ListAPIView):
         return StaffTeam.objects.filter(event_id=event_id).prefetch_related(
             "members__staff__user", "members__staff__info"
         )
+
+    def get(self, request, event_id, *args, **kwargs):
+        catalog = get_team_catalog(event_id)
+        return HttpResponse(catalog["content"], content_type="application/json")
+
+
+@conditional_get(astaff_teams_validators)
+async def read_staff_teams(request, event_id):
+    """ASGI-native GET of ``StaffTeamsByEventAPIView``."""
+    catalog = await aget_team_catalog(event_id)
+    return HttpResponse(catalog["content"], content_type="application/json")